@@ -0,0 +1,115 @@
+"""
+Size-versus-accuracy report for compressing the saved Random Forest.
+
+Trains the Random Forest from src/models.py, then for every combination of
+kept trees, depth cap and storage precision writes the compact .npz from
+src/compression.py and reports artifact size, load time, prediction latency
+(1 row and a 10,000-row batch) and test R²/RMSE against the pickled model,
+plus the size of the same artifact zlib-compressed.
+Run from the benchmarks/ directory:
+    python bench_compression.py
+"""
+
+import sys
+import os
+import json
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compression import PRECISIONS, compress_model, save_compact
+from src.evaluation import evaluate_predictions
+from src.models import prepare_data, train_random_forest
+from src.tree_engine import FlatForest
+
+TREES = [100, 50, 25, 10]
+DEPTHS = [15, 12, 10, 8]
+data_path = "../data/processed/housing_cleaned.csv"
+results_path = "../reports/results/benchmark_compression.json"
+
+
+def best_time(func, *args, repeats=5):
+    """Fastest of several calls."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def measure(path, load, X_test, y_test):
+    """Size, load time, latencies and test metrics of one artifact."""
+    model = load(path)
+    metrics = evaluate_predictions(y_test, model.predict(X_test))
+    batch = X_test.iloc[np.arange(10_000) % len(X_test)]
+    return {
+        "size_mb": os.path.getsize(path) / 1e6,
+        "load_s": best_time(load, path),
+        "latency_1_ms": best_time(model.predict, X_test.iloc[:1]) * 1000,
+        "latency_10k_ms": best_time(model.predict, batch) * 1000,
+        "r2": metrics["r2"],
+        "rmse": metrics["rmse"]
+    }
+
+
+def main():
+    print("\n" + "★" * 60)
+    print("Benchmark: Random Forest compression")
+    print("★" * 60)
+
+    df = pd.read_csv(data_path)
+    X_train, X_test, y_train, y_test = prepare_data(df)
+    model = train_random_forest(X_train, y_train, X_test, y_test)["model"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, "random_forest.pkl")
+        with open(pickle_path, "wb") as f:
+            pickle.dump(model, f)
+        baseline = {"trees": model.n_estimators, "max_depth": model.max_depth,
+                    "precision": "pickle", **measure(pickle_path, load_pickle, X_test, y_test)}
+        print(f"\n{'trees':>5} {'depth':>5} {'precision':>9} {'MB':>7} {'zlib MB':>7} {'load ms':>8} "
+              f"{'1 row ms':>8} {'10k ms':>8} {'dR2':>8} {'dRMSE':>8}")
+
+        results = [baseline]
+        forest = FlatForest.from_sklearn(model)
+        for n_trees in TREES:
+            for depth in DEPTHS:
+                compressed = compress_model(forest, n_trees, depth)
+                for precision in PRECISIONS:
+                    path = os.path.join(tmp, f"rf_{n_trees}_{depth}_{precision}.npz")
+                    zipped_path = path.replace(".npz", "_zlib.npz")
+                    save_compact(compressed, path, precision)
+                    save_compact(compressed, zipped_path, precision, compress=True)
+                    results.append({"trees": n_trees, "max_depth": depth, "precision": precision,
+                                    "nodes": compressed.n_nodes,
+                                    "compressed_mb": os.path.getsize(zipped_path) / 1e6,
+                                    **measure(path, FlatForest.load, X_test, y_test)})
+
+    for r in results:
+        r["r2_change"] = r["r2"] - baseline["r2"]
+        r["rmse_change"] = r["rmse"] - baseline["rmse"]
+        zipped = f"{r['compressed_mb']:7.2f}" if "compressed_mb" in r else f"{'-':>7}"
+        print(f"{r['trees']:>5} {r['max_depth']:>5} {r['precision']:>9} {r['size_mb']:7.2f} {zipped} "
+              f"{r['load_s'] * 1000:8.1f} {r['latency_1_ms']:8.2f} {r['latency_10k_ms']:8.1f} "
+              f"{r['r2_change']:+8.4f} {r['rmse_change']:+8.0f}")
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of histogram gradient boosting against the Random Forest on scaled-up data.
+
+Builds synthetic datasets of growing size, preprocesses them like
+02_data_preprocessing.py and trains train_hist_gradient_boosting and
+train_random_forest from src/models.py on the same split, recording training
+time, test R²/RMSE and the boosting iterations kept by early stopping. The
+Random Forest is skipped above --max-forest-rows. Run from the benchmarks/ directory:
+    python bench_gradient_boosting.py
+    python bench_gradient_boosting.py --rows 20000 200000 2000000 --max-forest-rows 200000
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import prepare_data, train_hist_gradient_boosting, train_random_forest
+from src.preprocessor import HousingPreprocessor
+from synthetic import make_synthetic_housing
+
+results_path = "../reports/results/benchmark_gradient_boosting.json"
+
+TRAINERS = {
+    "Random Forest": train_random_forest,
+    "Gradient Boosting": train_hist_gradient_boosting
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gradient boosting against the Random Forest.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 100_000, 400_000])
+    parser.add_argument("--max-forest-rows", type=int, default=400_000,
+                        help="Skip the Random Forest on larger datasets")
+    args = parser.parse_args()
+
+    print("\n" + "★" * 60)
+    print("Benchmark: histogram gradient boosting vs. Random Forest")
+    print("★" * 60)
+
+    results = []
+    for n_rows in args.rows:
+        df = HousingPreprocessor().fit_transform(make_synthetic_housing(n_rows))
+        X_train, X_test, y_train, y_test = prepare_data(df)
+        print(f"\n{n_rows:,} raw rows ({len(X_train):,} training rows)")
+
+        for name, trainer in TRAINERS.items():
+            if name == "Random Forest" and n_rows > args.max_forest_rows:
+                print(f"   {name:<18} skipped")
+                continue
+            start = time.perf_counter()
+            res = trainer(X_train, y_train, X_test, y_test, n_jobs=-1)
+            seconds = time.perf_counter() - start
+
+            results.append({
+                "model": name,
+                "rows": n_rows,
+                "train_rows": len(X_train),
+                "seconds": seconds,
+                "r2": res["r2"],
+                "rmse": res["rmse"],
+                "n_iter": res.get("n_iter")
+            })
+            iterations = f", {res['n_iter']} iterations" if "n_iter" in res else ""
+            print(f"   {name:<18} {seconds:8.2f}s   R2 {res['r2']:.4f}   "
+                  f"RMSE ${res['rmse']:,.0f}{iterations}")
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of package import cost for a scoring process.
+
+Each scenario runs in a fresh interpreter that imports what it needs, loads
+the saved Random Forest and predicts one raw record, reporting import time,
+time to the first prediction and peak RSS:
+- eager: every src submodule, as the package __init__ used to import them
+- lazy: `import src` plus the names the scoring code uses
+- inference: `src.inference.Predictor` only
+- flat: `src.inference.Predictor` on the forest saved as a FlatForest .npz,
+  which needs no scikit-learn
+Run from the benchmarks/ directory after 04_machine_learning.py:
+    python bench_imports.py
+"""
+
+import sys
+import os
+import json
+import statistics
+import subprocess
+import tempfile
+import pickle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.tree_engine import FlatForest
+
+MODEL_PATH = os.path.join(ROOT, "reports", "models", "random_forest.pkl")
+PREPROCESSOR_PATH = os.path.join(ROOT, "reports", "models", "preprocessor.json")
+results_path = "../reports/results/benchmark_imports.json"
+REPEATS = 5
+
+SCENARIOS = {
+    "eager": (
+        "import src.data_processing, src.preprocessor, src.stats, src.visualization, "
+        "src.figures, src.models, src.evaluation\n"
+        "from src.inference import Predictor"
+    ),
+    "lazy": "import src\nfrom src.inference import Predictor",
+    "inference": "from src.inference import Predictor",
+    "flat": "from src.inference import Predictor"
+}
+
+CHILD = """
+import json, resource, sys, time
+
+def peak_rss_mb():
+    # VmHWM belongs to this executable; ru_maxrss can carry over the parent's peak after fork/exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+predictor = Predictor({model!r}, {preprocessor!r})
+predictor.predict({{'longitude': -122.23, 'latitude': 37.88, 'housing_median_age': 41.0,
+                   'total_rooms': 880.0, 'total_bedrooms': 129.0, 'population': 322.0,
+                   'households': 126.0, 'median_income': 8.3252, 'ocean_proximity': 'NEAR BAY'}})
+done = time.perf_counter()
+print(json.dumps({{
+    'import_s': imported - start,
+    'first_prediction_s': done - start,
+    'peak_rss_mb': peak_rss_mb(),
+    'modules': len(sys.modules),
+    'matplotlib': 'matplotlib' in sys.modules,
+    'seaborn': 'seaborn' in sys.modules
+}}))
+"""
+
+
+def run_child(imports, model_path):
+    code = CHILD.format(imports=imports, model=model_path, preprocessor=PREPROCESSOR_PATH)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print("\n" + "★" * 60)
+    print("Benchmark: import cost of a scoring process")
+    print("★" * 60)
+
+    if not os.path.exists(MODEL_PATH):
+        print(f"\nError: Trained model not found at {MODEL_PATH}")
+        return
+
+    tmp = tempfile.mkdtemp()
+    flat_path = os.path.join(tmp, "random_forest.npz")
+    with open(MODEL_PATH, "rb") as f:
+        FlatForest.from_sklearn(pickle.load(f)).save(flat_path)
+
+    results = []
+    for name, imports in SCENARIOS.items():
+        model_path = flat_path if name == "flat" else MODEL_PATH
+        runs = [run_child(imports, model_path) for _ in range(REPEATS)]
+        summary = {
+            "scenario": name,
+            "import_s": statistics.median(r["import_s"] for r in runs),
+            "first_prediction_s": statistics.median(r["first_prediction_s"] for r in runs),
+            "peak_rss_mb": statistics.median(r["peak_rss_mb"] for r in runs),
+            "modules": runs[0]["modules"],
+            "matplotlib_loaded": runs[0]["matplotlib"],
+            "seaborn_loaded": runs[0]["seaborn"]
+        }
+        results.append(summary)
+        print(f"   {name:<10} import {summary['import_s']:6.3f}s   first prediction "
+              f"{summary['first_prediction_s']:6.3f}s   peak RSS {summary['peak_rss_mb']:7.1f} MB   "
+              f"{summary['modules']} modules")
+
+    os.remove(flat_path)
+    os.rmdir(tmp)
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Memory report for typed loading against the default load_data.
+
+Every measurement runs in a fresh interpreter so peak RSS is not shared
+between modes. Run from the benchmarks/ directory:
+    python bench_load_data.py
+"""
+
+import sys
+import os
+import json
+import resource
+import subprocess
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import write_synthetic_housing
+
+SCALES = [1, 10, 100]
+BASE_ROWS = 20_640
+results_path = "../reports/results/benchmark_load_data.json"
+
+MODES = {
+    "default": {},
+    "typed": {"typed": True},
+    "typed_pyarrow": {"typed": True, "engine": "pyarrow"}
+}
+
+
+def measure(path, options):
+    """Loading a file in this process and returning time, RSS and frame size."""
+    from src.data_processing import load_data
+
+    # ru_maxrss is reported in kilobytes on Linux
+    import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    start = time.perf_counter()
+    df = load_data(path, **options)
+    elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss / 1e6,
+        "load_rss_mb": (peak_rss - import_rss) / 1e6,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+        "rows": len(df)
+    }
+
+
+def measure_in_subprocess(path, options):
+    """Running measure() in a fresh interpreter, or None if the mode is unavailable."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path, json.dumps(options)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout)
+
+
+def main():
+    print("\n" + "★" * 60)
+    print("Benchmark: load_data memory and time")
+    print("★" * 60)
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            path = write_synthetic_housing(BASE_ROWS * scale, os.path.join(tmp, f"housing_{scale}x.csv"))
+            print(f"\n{scale}x ({BASE_ROWS * scale:,} rows)")
+
+            baseline = None
+            for mode, options in MODES.items():
+                m = measure_in_subprocess(path, options)
+                if m is None:
+                    print(f"   {mode:<14} unavailable")
+                    continue
+                baseline = baseline or m
+                m.update(scale=scale, mode=mode,
+                         rss_vs_default=m["load_rss_mb"] / max(baseline["load_rss_mb"], 1e-6),
+                         time_vs_default=m["seconds"] / baseline["seconds"])
+                results.append(m)
+                print(f"   {mode:<14} {m['seconds']:7.3f}s  peak RSS {m['peak_rss_mb']:8.1f} MB "
+                      f"(+{m['load_rss_mb']:.1f} MB for loading)  "
+                      f"frame {m['frame_mb']:8.1f} MB  "
+                      f"({m['rss_vs_default']:.2f}x RSS, {m['time_vs_default']:.2f}x time)")
+
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        print(json.dumps(measure(sys.argv[2], json.loads(sys.argv[3]))))
+    else:
+        main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the vectorized remove_outliers against the original column loop.
+
+Run from the benchmarks/ directory:
+    python bench_remove_outliers.py
+"""
+
+import sys
+import os
+import json
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_processing import handle_missing_values, remove_outliers
+from synthetic import make_synthetic_housing
+
+ROW_COUNTS = [20_640, 206_400, 2_064_000]
+REPEATS = 3
+results_path = "../reports/results/benchmark_remove_outliers.json"
+
+
+def remove_outliers_loop(df):
+    """Original implementation: one quantile pair and one filtered copy per column."""
+    df = df.copy()
+    numeric_cols = df.select_dtypes(include=np.number).columns
+    numeric_cols = [col for col in numeric_cols if col != 'median_house_value']
+
+    for col in numeric_cols:
+        Q1 = df[col].quantile(0.25)
+        Q3 = df[col].quantile(0.75)
+        IQR = Q3 - Q1
+        df = df[(df[col] >= Q1 - 1.5 * IQR) & (df[col] <= Q3 + 1.5 * IQR)]
+
+    return df
+
+
+def best_time(func, df):
+    """Returning the fastest of REPEATS runs and the last result."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        out = func(df)
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main():
+    print("\n" + "★" * 60)
+    print("Benchmark: remove_outliers")
+    print("★" * 60)
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    results = []
+
+    for n_rows in ROW_COUNTS:
+        df = handle_missing_values(make_synthetic_housing(n_rows))
+
+        loop_time, loop_out = best_time(remove_outliers_loop, df)
+        seq_time, seq_out = best_time(lambda d: remove_outliers(d, mode='sequential'), df)
+        ind_time, ind_out = best_time(lambda d: remove_outliers(d, mode='independent'), df)
+
+        row = {
+            "rows": n_rows,
+            "loop_seconds": loop_time,
+            "sequential_seconds": seq_time,
+            "independent_seconds": ind_time,
+            "sequential_speedup": loop_time / seq_time,
+            "independent_speedup": loop_time / ind_time,
+            "sequential_matches_loop": bool(seq_out.index.equals(loop_out.index)),
+            "rows_kept_sequential": len(seq_out),
+            "rows_kept_independent": len(ind_out),
+            "rows_only_sequential": len(seq_out.index.difference(ind_out.index)),
+            "rows_only_independent": len(ind_out.index.difference(seq_out.index))
+        }
+        results.append(row)
+
+        print(f"\n{n_rows:,} rows")
+        print(f"   loop:        {loop_time:.4f}s")
+        print(f"   sequential:  {seq_time:.4f}s ({row['sequential_speedup']:.1f}x, "
+              f"identical rows: {row['sequential_matches_loop']})")
+        print(f"   independent: {ind_time:.4f}s ({row['independent_speedup']:.1f}x)")
+        print(f"   rows kept:   sequential {row['rows_kept_sequential']:,}, "
+              f"independent {row['rows_kept_independent']:,} "
+              f"(+{row['rows_only_independent']:,} / -{row['rows_only_sequential']:,})")
+
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
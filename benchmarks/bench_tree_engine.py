@@ -0,0 +1,82 @@
+"""
+Benchmark of the flattened tree engine against sklearn's predict.
+
+Trains the Decision Tree and Random Forest from src/models.py on the
+processed data, checks that FlatForest reproduces sklearn's predictions and
+times both for batch sizes from 1 to 1M rows. Run from the benchmarks/ directory:
+    python bench_tree_engine.py
+"""
+
+import sys
+import os
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import prepare_data, train_decision_tree, train_random_forest
+from src.tree_engine import FlatForest, verify_against_sklearn
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]
+data_path = "../data/processed/housing_cleaned.csv"
+results_path = "../reports/results/benchmark_tree_engine.json"
+
+
+def best_time(func, X, budget=1.0):
+    """Repeating func(X) for about budget seconds and returning the fastest call."""
+    times = []
+    start = time.perf_counter()
+    while not times or (time.perf_counter() - start < budget and len(times) < 50):
+        t = time.perf_counter()
+        func(X)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def main():
+    print("\n" + "★" * 60)
+    print("Benchmark: flattened tree engine vs. sklearn")
+    print("★" * 60)
+
+    df = pd.read_csv(data_path)
+    X_train, X_test, y_train, y_test = prepare_data(df)
+
+    rng = np.random.default_rng(42)
+    X_all = X_test.to_numpy(dtype=np.float32)
+    X_big = X_all[rng.integers(0, len(X_all), max(BATCH_SIZES))]
+    X_big_df = pd.DataFrame(X_big, columns=X_test.columns)
+
+    results = []
+    for name, trainer in [("Decision Tree", train_decision_tree), ("Random Forest", train_random_forest)]:
+        model = trainer(X_train, y_train, X_test, y_test)["model"]
+        flat = FlatForest.from_sklearn(model)
+        max_diff = verify_against_sklearn(model, X_test, flat)
+        print(f"\n{name}: {flat.n_trees} trees, {flat.n_nodes:,} nodes, "
+              f"max |FlatForest - sklearn| = {max_diff:.3g}")
+
+        for batch in BATCH_SIZES:
+            sk_time = best_time(model.predict, X_big_df.iloc[:batch])
+            flat_time = best_time(flat.predict, X_big[:batch])
+            results.append({
+                "model": name,
+                "batch_size": batch,
+                "sklearn_seconds": sk_time,
+                "flat_seconds": flat_time,
+                "speedup": sk_time / flat_time,
+                "max_abs_diff": max_diff
+            })
+            print(f"   batch {batch:>9,}: sklearn {sk_time * 1000:10.3f} ms   "
+                  f"flat {flat_time * 1000:10.3f} ms   ({sk_time / flat_time:.2f}x)")
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
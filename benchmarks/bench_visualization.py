@@ -0,0 +1,81 @@
+"""
+Benchmark of the point-based plots in aggregated vs. point-per-row mode.
+
+Renders the scatter, geographic, violin and pair plots from
+src/visualization.py on synthetic datasets of growing size and records
+render time and PNG size. Point-per-row rendering is skipped above
+--max-points-rows. Run from the benchmarks/ directory:
+    python bench_visualization.py
+    python bench_visualization.py --rows 20000 200000 2000000 10000000
+"""
+
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.visualization import plot_scatter, plot_geographic, plot_violin, plot_pairplot, save_plot
+from synthetic import make_synthetic_housing
+
+results_path = "../reports/results/benchmark_visualization.json"
+
+PLOTS = {
+    "scatter": lambda df, aggregate: plot_scatter(
+        df, "median_income", "median_house_value", "Income vs Price", aggregate=aggregate),
+    "geographic": lambda df, aggregate: plot_geographic(
+        df, "median_house_value", "Geographic Distribution", aggregate=aggregate),
+    "violin": lambda df, aggregate: plot_violin(
+        df, "ocean_proximity", "median_house_value", "Price by Ocean Proximity", aggregate=aggregate),
+    "pairplot": lambda df, aggregate: plot_pairplot(
+        df, ["median_income", "housing_median_age", "median_house_value"], aggregate=aggregate)
+}
+
+
+def render(plot, df, aggregate, path):
+    """Drawing and saving one figure, returning seconds and file size in bytes."""
+    start = time.perf_counter()
+    save_plot(PLOTS[plot](df, aggregate), path)
+    return time.perf_counter() - start, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark aggregated plot rendering.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 200_000, 2_000_000])
+    parser.add_argument("--max-points-rows", type=int, default=200_000,
+                        help="Skip point-per-row rendering on larger datasets")
+    args = parser.parse_args()
+
+    print("\n" + "★" * 60)
+    print("Benchmark: aggregated vs. point-per-row plots")
+    print("★" * 60)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            df = make_synthetic_housing(n_rows)
+            print(f"\n{n_rows:,} rows")
+            for plot in PLOTS:
+                modes = [True] + ([False] if n_rows <= args.max_points_rows else [])
+                for aggregate in modes:
+                    seconds, size = render(plot, df, aggregate, os.path.join(tmp, f"{plot}.png"))
+                    results.append({"plot": plot, "rows": n_rows, "aggregate": aggregate,
+                                    "seconds": seconds, "file_kb": size / 1e3})
+                    mode = "aggregated" if aggregate else "points"
+                    print(f"   {plot:<11} {mode:<11} {seconds:8.2f}s  {size / 1e3:9.1f} KB")
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print(f"\nResults saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Stage-level benchmark suite on synthetic scale-up datasets.
+
+Times every pipeline stage and measures its peak memory on datasets
+synthesized at multiples of data/raw/housing.csv, writes the results as JSON
+and flags regressions against a stored baseline.
+
+Run from the benchmarks/ directory:
+    python run_benchmarks.py                         # 10x and 100x
+    python run_benchmarks.py --scales 10 100 1000    # up to ~20M rows
+    python run_benchmarks.py --save-baseline         # store this run as the baseline
+
+Peak memory is what tracemalloc sees (Python and NumPy allocations), so
+buffers allocated inside sklearn's compiled code are not counted.
+Exits with status 1 when a stage regressed, so it can gate CI.
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_processing import load_data, handle_missing_values, remove_outliers, create_features
+from src.models import (
+    prepare_data,
+    train_linear_regression,
+    train_decision_tree,
+    train_random_forest
+)
+from synthetic import write_synthetic_housing
+
+BASE_ROWS = 20_640
+results_path = "../reports/results/benchmark_suite.json"
+baseline_path = "baseline.json"
+
+
+def run_stage(func, *args):
+    """Running one stage and returning its result, wall time and peak traced memory."""
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - start_memory
+    return result, elapsed, peak
+
+
+def benchmark_scale(scale, tmp, max_train_rows):
+    """Running every stage on one synthetic dataset."""
+    n_rows = BASE_ROWS * scale
+    path = write_synthetic_housing(n_rows, os.path.join(tmp, f"housing_{scale}x.csv"))
+    records = []
+
+    def record(stage, rows_in, elapsed, peak, rows_out=None):
+        records.append({
+            "scale": scale, "stage": stage, "rows_in": rows_in,
+            "rows_out": rows_out if rows_out is not None else rows_in,
+            "seconds": elapsed, "peak_memory_mb": peak / 1e6
+        })
+        print(f"   {stage:<26} {elapsed:9.3f}s  {peak / 1e6:9.1f} MB")
+
+    df, t, m = run_stage(load_data, path)
+    record("load_data", n_rows, t, m)
+    df, t, m = run_stage(handle_missing_values, df)
+    record("handle_missing_values", len(df), t, m)
+    rows_in = len(df)
+    df, t, m = run_stage(remove_outliers, df)
+    record("remove_outliers", rows_in, t, m, len(df))
+    df, t, m = run_stage(create_features, df)
+    record("create_features", len(df), t, m)
+    df, t, m = run_stage(lambda d: pd.get_dummies(d, columns=['ocean_proximity'], drop_first=True), df)
+    record("get_dummies", len(df), t, m)
+
+    if len(df) > max_train_rows:
+        print(f"   training stages skipped ({len(df):,} rows > --max-train-rows)")
+        return records
+
+    X_train, X_test, y_train, y_test = prepare_data(df)
+    del df
+    for stage, trainer in [("train_linear_regression", train_linear_regression),
+                           ("train_decision_tree", train_decision_tree),
+                           ("train_random_forest", train_random_forest)]:
+        res, t, m = run_stage(trainer, X_train, y_train, X_test, y_test)
+        record(stage, len(X_train), t, m)
+
+    _, t, m = run_stage(res["model"].predict, X_test)
+    record("predict_random_forest", len(X_test), t, m)
+    return records
+
+
+def find_regressions(records, baseline, tolerance, min_seconds):
+    """Comparing records with the baseline; slower or larger than tolerance counts as a regression."""
+    previous = {(r["scale"], r["stage"]): r for r in baseline["records"]}
+    regressions = []
+    for r in records:
+        base = previous.get((r["scale"], r["stage"]))
+        if base is None:
+            continue
+        for metric, floor in [("seconds", min_seconds), ("peak_memory_mb", 1.0)]:
+            if r[metric] > max(base[metric], floor) * (1 + tolerance):
+                regressions.append({
+                    "scale": r["scale"], "stage": r["stage"], "metric": metric,
+                    "baseline": base[metric], "current": r[metric],
+                    "ratio": r[metric] / base[metric] if base[metric] else float("inf")
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage at scale.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100],
+                        help="Multiples of the 20,640-row dataset")
+    parser.add_argument("--max-train-rows", type=int, default=2_500_000,
+                        help="Skip the training stages on larger datasets")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth before flagging")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Ignore timing changes of stages faster than this")
+    parser.add_argument("--baseline", default=baseline_path)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    print("\n" + "★" * 60)
+    print("Benchmark Suite")
+    print("★" * 60)
+
+    tracemalloc.start()
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            print(f"\n{scale}x ({BASE_ROWS * scale:,} rows)")
+            records.extend(benchmark_scale(scale, tmp, args.max_train_rows))
+    tracemalloc.stop()
+
+    report = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count(), "pandas": pd.__version__},
+        "records": records,
+        "regressions": []
+    }
+
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = find_regressions(records, json.load(f),
+                                                     args.tolerance, args.min_seconds)
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nResults saved to {results_path}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+
+    if report["regressions"]:
+        print(f"\n{len(report['regressions'])} regression(s) against {args.baseline}:")
+        for r in report["regressions"]:
+            print(f"   {r['scale']}x {r['stage']:<26} {r['metric']:<15} "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['ratio']:.2f}x)")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
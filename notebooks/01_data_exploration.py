@@ -1,14 +1,23 @@
-import pandas as pd
+import sys
 import os
+import pandas as pd
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stats import compute_stats
 
 # Path to the raw housing dataset
 DATA_PATH = "../data/raw/housing.csv"
 
+# Cache directory for the computed statistics
+CACHE_PATH = "../data/cache"
+
 
 def main():
     """
     Performs initial data exploration:
-    - Loads dataset
+    - Scans the dataset once for its statistics
     - Prints structure, statistics, and missing values
     - Gives an overview of the target variable
     """
@@ -22,52 +31,59 @@ def main():
     if not os.path.exists(DATA_PATH):
         print(f"\nError: Data file not found at {DATA_PATH}")
         print("Download from: https://www.kaggle.com/datasets/camnugent/california-housing-prices")
-        return
+        return 1
 
-    # Loading the dataset into a pandas DataFrame
-    df = pd.read_csv(DATA_PATH)
-    print(f"\nData loaded: {df.shape[0]:,} rows x {df.shape[1]} columns")
+    # Computing every statistic below in one parallel, chunked pass over the file
+    # (cached in ../data/cache until the file changes)
+    stats = compute_stats(DATA_PATH, cache_dir=CACHE_PATH)
+    print(f"\nData loaded: {stats.rows:,} rows x {len(stats.columns)} columns")
 
     # Displaying the dataset structure and data types
     print(f"\n{'★' * 10} Dataset Info {'★' * 14}")
-    print(df.info())
+    info = pd.DataFrame({
+        "Non-Null Count": stats.rows - stats.missing,
+        "Dtype": pd.Series(stats.dtypes)
+    })
+    print(info)
 
     # Showing the first 5 rows for a quick preview
     print(f"\n{'★' * 17} First 5 Rows {'★' * 20}")
-    print(df.head())
+    print(pd.read_csv(DATA_PATH, nrows=5))
 
     # Displaying descriptive statistics for numeric columns
     print(f"\n{'★' * 17} Descriptive Statistics {'★' * 19}")
-    print(df.describe())
+    summary = stats.describe()
+    print(summary)
 
     # Identifying missing values in each column
     print(f"\n{'★' * 5} Missing Values {'★' * 7}")
-    missing = df.isnull().sum()
+    missing = stats.missing
     print(missing[missing > 0] if missing.sum() > 0 else "No missing values")
 
     # Analyzing categorical feature distribution
     print(f"\n{'★' * 5} Categorical Features {'★' * 7}")
     print("\nOcean Proximity Distribution:")
-    print(df['ocean_proximity'].value_counts())
+    print(stats.value_counts('ocean_proximity'))
 
     # Summarizing statistics for the target variable
+    target = summary['median_house_value']
     print(f"\n{'★' * 5} Target Variable (median_house_value) {'★' * 5}")
-    print(f"Mean:   ${df['median_house_value'].mean():,.2f}")
-    print(f"Median: ${df['median_house_value'].median():,.2f}")
-    print(f"Min:    ${df['median_house_value'].min():,.2f}")
-    print(f"Max:    ${df['median_house_value'].max():,.2f}")
+    print(f"Mean:   ${target['mean']:,.2f}")
+    print(f"Median: ${target['50%']:,.2f}")
+    print(f"Min:    ${target['min']:,.2f}")
+    print(f"Max:    ${target['max']:,.2f}")
 
     # Final summary of dataset quality
     print("\n" + "★" * 43)
     print("Summary")
     print("★" * 43)
-    print(f"Total samples: {df.shape[0]:,}")
-    print(f"Total features: {df.shape[1]}")
-    print(f"Missing values: {df.isnull().sum().sum()}")
-    print(f"Duplicates: {df.duplicated().sum()}")
+    print(f"Total samples: {stats.rows:,}")
+    print(f"Total features: {len(stats.columns)}")
+    print(f"Missing values: {stats.missing.sum()}")
+    print(f"Duplicates: {stats.duplicates}")
     print("\nNext: Run 02_data_preprocessing.py")
     print("★" * 43)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -4,12 +4,17 @@ import os
 # Adding the project root to the Python path as it allows importing modules from the src/ directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Importing preprocessing function
-from src.data_processing import preprocess_data
+# Importing preprocessing function and the reusable preprocessor
+from src.data_processing import preprocess_data_incremental, load_data
+from src.preprocessor import HousingPreprocessor
+from src.instrumentation import enable_from_env
 
 # File paths
 Raw_path = "../data/raw/housing.csv"
 Processed_path = "../data/processed/housing_cleaned.csv"
+Preprocessor_path = "../reports/models/preprocessor.json"
+Cache_path = "../data/cache"
+State_path = f"{Cache_path}/preprocess_state.json"
 
 
 def main():
@@ -21,12 +26,17 @@ def main():
     # Ensuring the output directories exist
     os.makedirs("../data/processed", exist_ok=True)
     os.makedirs("../reports/results", exist_ok=True)
+    os.makedirs("../reports/models", exist_ok=True)
+
+    # Optional per-stage timing/memory report (set HOUSING_INSTRUMENT=1)
+    if enable_from_env("preprocessing", "../reports/results"):
+        print("Instrumentation enabled: ../reports/results/instrumentation_preprocessing.json")
 
     try:
         # Checking if the raw dataset exists
         if not os.path.exists(Raw_path):
             print(f"\nError: Raw data not found at {Raw_path}")
-            return
+            return 1
 
         # Displaying the preprocessing steps
         print("\nProcessing steps:")
@@ -36,29 +46,35 @@ def main():
         print("4. Creating new features...")
         print("5. Encoding categorical variables...")
 
-        # Running preprocessing pipeline
-        df = preprocess_data(Raw_path, Processed_path)
+        # Running preprocessing pipeline, only on the rows appended since the last run
+        report = preprocess_data_incremental(Raw_path, Processed_path, State_path)
+        print(f"\nMode: {report['mode']} ({report['reason']})")
+        print(f"Rows processed: {report['rows_processed']:,}, "
+              f"skipped (already processed): {report['rows_skipped']:,}")
+        stats = report['stats']
+        if stats['exact']:
+            print(f"Statistics: exact (all {stats['rows_seen']:,} rows)")
+        else:
+            print(f"Statistics: approximate (median and IQR bounds estimated from a "
+                  f"random sample of the {stats['rows_seen']:,} rows)")
+        df = load_data(Processed_path)
 
         # Printing preprocessing results
         print("\n" + "★" * 29)
         print(f"{'★' * 10} RESULTS {'★' * 12}")
         print("★" * 29)
 
-        print(f"Original shape:  20,640 x 10")
-        print(f"Processed shape: {df.shape[0]:,} x {df.shape[1]}")
-        print(f"Rows removed:    {20640 - df.shape[0]:,} "
-              f"({((20640 - df.shape[0]) / 20640) * 100:.1f}%)")
-        print(f"Features added:  {df.shape[1] - 10}")
+        rows_in, rows_out = report['rows_in'], report['rows_out']
+        print(f"Original shape:  {rows_in:,} x {len(report['columns'])}")
+        print(f"Processed shape: {rows_out:,} x {df.shape[1]}")
+        print(f"Rows removed:    {rows_in - rows_out:,} "
+              f"({((rows_in - rows_out) / rows_in) * 100:.1f}%)")
+
+        print(f"Features added:  {df.shape[1] - len(report['columns'])}")
         print(f"Missing values:  {df.isnull().sum().sum()}")
 
         # Identifying newly created features
-        original_cols = [
-            'longitude', 'latitude', 'housing_median_age', 'total_rooms',
-            'total_bedrooms', 'population', 'households', 'median_income',
-            'median_house_value', 'ocean_proximity'
-        ]
-
-        new_cols = [col for col in df.columns if col not in original_cols]
+        new_cols = [col for col in df.columns if col not in report['columns']]
 
         print(f"\nNew features created ({len(new_cols)}):")
         for col in new_cols:
@@ -67,6 +83,12 @@ def main():
         # Saving the processed dataset
         print(f"\nData saved to: {Processed_path}")
 
+        # Saving the statistics the processed rows were built with, so new raw
+        # records are transformed exactly like the training data
+        preprocessor = HousingPreprocessor.from_statistics(stats, df.columns)
+        preprocessor.save(Preprocessor_path)
+        print(f"Preprocessor saved to: {Preprocessor_path}")
+
         print(f"\n{'★' * 10} PREPROCESSING COMPLETE {'★' * 12}")
         print(f"Clean dataset: {df.shape[0]:,} rows x {df.shape[1]} columns")
         print("\nNext: Run 03_eda_visualization.py")
@@ -74,7 +96,8 @@ def main():
     except Exception as e:
         # Catching and reporting any errors
         print(f"\nError: {e}")
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,25 +1,48 @@
 import sys
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Adding the project root directory to Python's module search path, this allows importing custom
 # modules from the src/ folder
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Importing reusable visualization functions
+# Importing the cached loader and reusable visualization functions
+from src.data_processing import load_data
+from src.instrumentation import enable_from_env
+from src.stats import compute_stats
+from src.figures import FigureSpec, build_figures
 from src.visualization import (
     plot_histogram, plot_scatter, plot_heatmap,
-    plot_boxplot, save_plot
+    plot_boxplot, plot_geographic
 )
 
 # Path to cleaned dataset produced during preprocessing
 data_path = "../data/processed/housing_cleaned.csv"
 
+# Binary cache of parsed datasets, reused instead of re-parsing the CSV
+cache_path = "../data/cache"
+
 # Directory where generated figures will be saved
 figures_path = "../reports/figures"
 
 
+def plot_rooms_vs_price(df, title):
+    """Boxplot of house prices by room density category."""
+    # Create categorical bins for room density
+    df_temp = df.copy()
+    df_temp['rooms_category'] = pd.cut(
+        df_temp['rooms_per_household'],
+        bins=5,
+        labels=['Very Low', 'Low', 'Medium', 'High', 'Very High']
+    )
+    return plot_boxplot(df_temp, 'rooms_category', 'median_house_value', title)
+
+
+def plot_correlation_heatmap(corr, title):
+    """Heatmap of a precomputed correlation matrix."""
+    return plot_heatmap(None, title, corr=corr)
+
+
 def main():
     # Printing header for EDA stage
     print("\n" + "★" * 40)
@@ -29,24 +52,33 @@ def main():
     # Creating directory for figures if it does not exist
     os.makedirs(figures_path, exist_ok=True)
 
+    # Optional per-stage timing/memory report (set HOUSING_INSTRUMENT=1)
+    if enable_from_env("eda", "../reports/results"):
+        print("Instrumentation enabled: ../reports/results/instrumentation_eda.json")
+
     try:
         # Checking if the processed dataset exists before loading it
         if not os.path.exists(data_path):
             print(f"\nError: Processed data not found at {data_path}")
-            return
+            return 1
 
-        # Loading cleaned housing dataset
-        df = pd.read_csv(data_path)
+        # Loading cleaned housing dataset (memory-mapped from the cache after the first run)
+        df = load_data(data_path, cache_dir=cache_path)
         print(f"\nData loaded: {df.shape[0]:,} rows x {df.shape[1]} columns")
 
+        # Summary statistics and correlations from one parallel pass over the CSV,
+        # cached and shared by the printed summary and the heatmap
+        stats = compute_stats(data_path, cache_dir=cache_path)
+
         # Displaying summary statistics for numerical features
         print(f"\n{'★' * 14} Statistical Analysis {'★' * 14}")
         print("\nDescriptive Statistics:")
-        print(df.describe())
+        print(stats.describe())
 
         # Computing correlation of each feature with target variable
         print("\nCorrelation with Target:")
-        corr = df.corr()['median_house_value'].sort_values(ascending=False)
+        corr_matrix = stats.corr()
+        corr = corr_matrix['median_house_value'].sort_values(ascending=False)
 
         # Displaying top correlations including target itself
         print("\nTop 5 correlations:")
@@ -55,90 +87,73 @@ def main():
         # Beginning visualization generation
         print(f"\n{'★' * 14} Creating Visualisations {'★' * 14}")
 
-        # Creating a counter to track number of plots created
-        viz_count = 0
+        # Declaring every figure with the columns it reads; figures whose inputs
+        # are unchanged since the last run are reused instead of redrawn
+        figures = []
 
         # Plot 1: Distribution of median house prices
         # Helps understand skewness and price concentration
-        print(f"{viz_count + 1}. Price distribution...")
-        fig = plot_histogram(df, 'median_house_value', 'Distribution of House Prices')
-        save_plot(fig, f"{figures_path}/01_price_distribution.png")
-        viz_count += 1
+        figures.append(FigureSpec(
+            "01_price_distribution.png", plot_histogram, df,
+            columns=['median_house_value'],
+            params={'column': 'median_house_value', 'title': 'Distribution of House Prices'}
+        ))
 
         # Plot 2: Distribution of median income
         # Shows income spread across districts
-        print(f"{viz_count + 1}. Income distribution...")
-        fig = plot_histogram(df, 'median_income', 'Distribution of Median Income')
-        save_plot(fig, f"{figures_path}/02_income_distribution.png")
-        viz_count += 1
+        figures.append(FigureSpec(
+            "02_income_distribution.png", plot_histogram, df,
+            columns=['median_income'],
+            params={'column': 'median_income', 'title': 'Distribution of Median Income'}
+        ))
 
         # Plot 3: Scatter plot of income vs house price
         # Used to visually inspect linear relationship
-        print(f"{viz_count + 1}. Income vs Price scatter...")
-        fig = plot_scatter(
-            df,
-            'median_income',
-            'median_house_value',
-            'House Price vs Median Income'
-        )
-        save_plot(fig, f"{figures_path}/03_income_vs_price.png")
-        viz_count += 1
+        figures.append(FigureSpec(
+            "03_income_vs_price.png", plot_scatter, df,
+            columns=['median_income', 'median_house_value'],
+            params={'x_col': 'median_income', 'y_col': 'median_house_value',
+                    'title': 'House Price vs Median Income'}
+        ))
 
         # Plot 4: Correlation heatmap
         # Highlights relationships between all numerical features
-        print(f"{viz_count + 1}. Correlation heatmap...")
-        fig = plot_heatmap(df, 'Feature Correlation Heatmap')
-        save_plot(fig, f"{figures_path}/04_correlation_heatmap.png")
-        viz_count += 1
+        numeric_columns = stats.numeric_columns
+        figures.append(FigureSpec(
+            "04_correlation_heatmap.png", plot_correlation_heatmap,
+            corr_matrix.loc[numeric_columns, numeric_columns],
+            params={'title': 'Feature Correlation Heatmap'}
+        ))
 
         # Plot 5: Boxplot of house prices by room density categories
         # Requires engineered feature 'rooms_per_household'
         if 'rooms_per_household' in df.columns:
-            print(f"{viz_count + 1}. Rooms vs Price boxplot...")
-
-            # Create categorical bins for room density
-            df_temp = df.copy()
-            df_temp['rooms_category'] = pd.cut(
-                df_temp['rooms_per_household'],
-                bins=5,
-                labels=['Very Low', 'Low', 'Medium', 'High', 'Very High']
-            )
-
-            fig = plot_boxplot(
-                df_temp,
-                'rooms_category',
-                'median_house_value',
-                'House Price by Rooms per Household'
-            )
-            save_plot(fig, f"{figures_path}/05_rooms_vs_price.png")
-            viz_count += 1
+            figures.append(FigureSpec(
+                "05_rooms_vs_price.png", plot_rooms_vs_price, df,
+                columns=['rooms_per_household', 'median_house_value'],
+                params={'title': 'House Price by Rooms per Household'}
+            ))
 
         # Plot 6: Geographic distribution of house prices
         # Visualizes spatial price patterns across California
+        # (large datasets are drawn as a grid of cell means instead of one point per row)
         if 'longitude' in df.columns and 'latitude' in df.columns:
-            print(f"{viz_count + 1}. Geographic distribution...")
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            scatter = ax.scatter(
-                df['longitude'],
-                df['latitude'],
-                c=df['median_house_value'],
-                cmap='viridis',
-                s=5,
-                alpha=0.6
-            )
-
-            plt.colorbar(scatter, label='Median House Value', ax=ax)
-            ax.set_title('Geographic Distribution of House Prices', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Longitude', fontsize=12)
-            ax.set_ylabel('Latitude', fontsize=12)
-            ax.grid(alpha=0.3)
-
-            save_plot(fig, f"{figures_path}/06_geographic_distribution.png")
-            viz_count += 1
+            figures.append(FigureSpec(
+                "06_geographic_distribution.png", plot_geographic, df,
+                columns=['longitude', 'latitude', 'median_house_value'],
+                params={'value_col': 'median_house_value',
+                        'title': 'Geographic Distribution of House Prices'}
+            ))
+
+        # Rendering the changed figures in parallel worker processes
+        summary = build_figures(figures, figures_path)
 
         # Summary of visualization output
-        print(f"\nTotal visualizations created: {viz_count}")
+        print(f"\nTotal visualizations: {len(figures)} "
+              f"({len(summary['rendered'])} rendered, {len(summary['reused'])} reused "
+              f"in {summary['wall_time']:.2f}s)")
+        for name in summary['rendered']:
+            print(f"   rendered {name}")
         print(f"Saved to: {figures_path}/")
 
         # Printing key insights derived from EDA
@@ -154,7 +169,8 @@ def main():
     except Exception as e:
         # Catching and displaying any unexpected errors
         print(f"\nError: {e}")
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
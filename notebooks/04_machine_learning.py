@@ -9,12 +9,18 @@ import matplotlib.pyplot as plt
 # This allows importing custom modules from the src/ folder
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import model-related helper functions
+# Import the cached loader and model-related helper functions
+from src.data_processing import load_data
+from src.instrumentation import enable_from_env
+from src.figures import FigureSpec, build_figures
 from src.models import (
-    prepare_data,
+    prepare_matrix,
     train_linear_regression,
     train_decision_tree,
-    train_random_forest
+    train_random_forest,
+    train_hist_gradient_boosting,
+    train_models_parallel,
+    train_models_serial
 )
 
 # Paths to input data and output directories
@@ -22,6 +28,44 @@ data_path = "../data/processed/housing_cleaned.csv"
 results_direction = "../reports/results"
 models_direction = "../reports/models"
 figures_direction = "../reports/figures"
+cache_direction = "../data/cache"
+summary_path = f"{results_direction}/training_summary.json"
+
+
+def plot_actual_vs_predicted(data, name):
+    """Scatter of actual vs predicted prices for one model."""
+    y_test, y_pred = data["Actual"], data[name]
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.scatter(y_test, y_pred, alpha=0.4)
+
+    ax.set_title(f"{name}: Actual vs Predicted Prices")
+    ax.set_xlabel("Actual Median House Value")
+    ax.set_ylabel("Predicted Median House Value")
+    ax.grid(alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_model_comparison(data):
+    """Bar charts of R² and RMSE per model."""
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    colors = ["steelblue", "coral", "green", "purple"]
+
+    # R² comparison
+    axes[0].bar(data["Model"], data["R2"], color=colors, edgecolor="black")
+    axes[0].set_title("Model Comparison – R²")
+    axes[0].set_ylim(0, 1)
+    axes[0].grid(axis="y", alpha=0.3)
+
+    # RMSE comparison
+    axes[1].bar(data["Model"], data["RMSE"], color=colors, edgecolor="black")
+    axes[1].set_title("Model Comparison – RMSE ($)")
+    axes[1].grid(axis="y", alpha=0.3)
+
+    fig.tight_layout()
+    return fig
 
 
 def main():
@@ -34,13 +78,17 @@ def main():
     for d in [results_direction, models_direction, figures_direction]:
         os.makedirs(d, exist_ok=True)
 
+    # Optional per-stage timing/memory report (set HOUSING_INSTRUMENT=1)
+    if enable_from_env("machine_learning", results_direction):
+        print(f"Instrumentation enabled: {results_direction}/instrumentation_machine_learning.json")
+
     # Check that processed data exists
     if not os.path.exists(data_path):
         print(f"\nError: Processed data not found at {data_path}")
-        return
+        return 1
 
-    # Load cleaned dataset
-    df = pd.read_csv(data_path)
+    # Load cleaned dataset (memory-mapped from the cache after the first run)
+    df = load_data(data_path, cache_dir=cache_direction)
     print(f"\nData loaded: {df.shape[0]:,} rows × {df.shape[1]} columns")
 
     # Prepare data (train-test split and feature/target separation)
@@ -48,7 +96,9 @@ def main():
     print("Preparing Data")
     print("★" * 40)
 
-    X_train, X_test, y_train, y_test = prepare_data(df)
+    # One contiguous feature matrix; the splits are views of it
+    matrix = prepare_matrix(df)
+    X_train, X_test, y_train, y_test = matrix.frames()
     print(f"Training samples: {len(X_train):,}")
     print(f"Test samples:     {len(X_test):,}")
     print(f"Features:         {X_train.shape[1]}")
@@ -61,26 +111,58 @@ def main():
     models = {
         "Linear Regression": train_linear_regression,
         "Decision Tree": train_decision_tree,
-        "Random Forest": train_random_forest
+        "Random Forest": train_random_forest,
+        "Gradient Boosting": train_hist_gradient_boosting
     }
 
+    # Serial baseline for the speedup: timed once, then reused while the
+    # models, training rows and cores are the same (delete training_summary.json to re-time)
+    baseline = {"Models": list(models), "Training rows": len(X_train), "Cores": os.cpu_count()}
+    try:
+        with open(summary_path) as f:
+            previous = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = {}
+    if all(previous.get(k) == v for k, v in baseline.items()) and previous.get("Serial time (s)"):
+        serial_time = previous["Serial time (s)"]
+        print(f"Serial baseline: {serial_time:.2f}s (from the previous run)")
+    else:
+        _, serial_time = train_models_serial(models, matrix, n_bootstrap=1000)
+        print(f"Serial baseline: {serial_time:.2f}s (models trained one after another)")
+
+    # Train all models concurrently; the ensembles share the spare cores and
+    # every worker attaches to the matrix in shared memory instead of a copy.
+    # n_bootstrap adds confidence intervals to each trainer's single scoring pass
+    trained, timing = train_models_parallel(models, matrix, n_bootstrap=1000,
+                                            serial_time=serial_time)
+    print(f"Trained {len(trained)} models in {timing['wall_time']:.2f}s "
+          f"({timing['speedup']:.2f}x speedup over serial, overlap {timing['overlap_ratio']:.2f}x, "
+          f"{timing['cores']} cores)")
+
     results = {}
 
-    # Train and evaluate each model
-    for i, (name, trainer) in enumerate(models.items(), start=1):
+    # Evaluate each model
+    for i, name in enumerate(models, start=1):
         print(f"\n{i}. {name}")
+        res = trained[name]
 
-        # Train model and evaluate performance
-        res = trainer(X_train, y_train, X_test, y_test)
+        # Bootstrap confidence intervals from the trainer's own evaluation pass
+        ci = res["ci"]
 
         # Store evaluation metrics
         results[name] = {
             "R2": res["r2"],
             "RMSE": res["rmse"],
-            "MAE": res["mae"]
+            "MAE": res["mae"],
+            "R2 95% CI": ci["r2"],
+            "RMSE 95% CI": ci["rmse"],
+            "MAE 95% CI": ci["mae"],
+            "Residual quantiles": res["residual_quantiles"],
+            "Train time (s)": res["train_time"]
         }
 
-        print(f"   R2: {res['r2']:.4f}, RMSE: ${res['rmse']:,.2f}")
+        print(f"   R2: {res['r2']:.4f} [{ci['r2'][0]:.4f}, {ci['r2'][1]:.4f}], "
+              f"RMSE: ${res['rmse']:,.2f}, trained in {res['train_time']:.2f}s")
 
         # Display feature importance only for models that support it
         # (Decision Tree and Random Forest)
@@ -99,63 +181,65 @@ def main():
         with open(f"{models_direction}/{name.lower().replace(' ', '_')}.pkl", "wb") as f:
             pickle.dump(res["model"], f)
 
-        # Create Actual vs Predicted visualization
-        y_pred = res["model"].predict(X_test)
-
-        fig, ax = plt.subplots(figsize=(6, 6))
-        ax.scatter(y_test, y_pred, alpha=0.4)
-
-        ax.set_title(f"{name}: Actual vs Predicted Prices")
-        ax.set_xlabel("Actual Median House Value")
-        ax.set_ylabel("Predicted Median House Value")
-        ax.grid(alpha=0.3)
-
-        plt.tight_layout()
-
-        # Numbered figure filenames (08, 09, 10)
-        figure_number = 7 + i  # i starts at 1 → 08, 09, 10
-
-        plt.savefig(
-            f"{figures_direction}/0{+figure_number}_{name.lower().replace(' ', '_')}_prediction.png",
-            dpi=300
-        )
-        plt.close()
-
-    # Create model comparison visualizations
+    # Declare the report figures; unchanged ones are reused from the last run
     print("\n" + "-" * 60)
     print("Creating Visualisation")
     print("-" * 60)
 
-    names = list(results.keys())
-    r2_scores = [results[m]["R2"] for m in names]
-    rmse_scores = [results[m]["RMSE"] for m in names]
-
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-    colors = ["steelblue", "coral", "green"]
-
-    # R² comparison
-    axes[0].bar(names, r2_scores, color=colors, edgecolor="black")
-    axes[0].set_title("Model Comparison – R²")
-    axes[0].set_ylim(0, 1)
-    axes[0].grid(axis="y", alpha=0.3)
-
-    # RMSE comparison
-    axes[1].bar(names, rmse_scores, color=colors, edgecolor="black")
-    axes[1].set_title("Model Comparison – RMSE ($)")
-    axes[1].grid(axis="y", alpha=0.3)
-
-    plt.tight_layout()
-    plt.savefig(f"{figures_direction}/07_model_comparison.png", dpi=300)
-    plt.close()
-
-    print("Model comparison saved")
+    # Actual vs Predicted, drawn from the stored test predictions
+    predictions = pd.DataFrame({"Actual": y_test.to_numpy()})
+    figures = []
+    for i, name in enumerate(models, start=1):
+        predictions[name] = trained[name]["predictions"]
+
+        # Numbered figure filenames (08, 09, 10, 11)
+        figure_number = 7 + i  # i starts at 1 → 08, 09, 10, 11
+        figures.append(FigureSpec(
+            f"0{+figure_number}_{name.lower().replace(' ', '_')}_prediction.png",
+            plot_actual_vs_predicted, predictions,
+            columns=["Actual", name], params={"name": name},
+            dpi=300, bbox_inches=None
+        ))
+
+    # Model comparison
+    comparison = pd.DataFrame({
+        "Model": list(results.keys()),
+        "R2": [m["R2"] for m in results.values()],
+        "RMSE": [m["RMSE"] for m in results.values()]
+    })
+    figures.append(FigureSpec(
+        "07_model_comparison.png", plot_model_comparison, comparison,
+        dpi=300, bbox_inches=None
+    ))
+
+    summary = build_figures(figures, figures_direction)
+    print(f"Figures: {len(summary['rendered'])} rendered, {len(summary['reused'])} reused "
+          f"in {summary['wall_time']:.2f}s")
 
     # Save results to JSON
     print("\n" + "★" * 15 + " SAVING RESULTS " + "★" * 15)
+    training_summary = {
+        **baseline,
+        "Wall time (s)": timing["wall_time"],
+        "Serial time (s)": serial_time,
+        "Speedup": timing["speedup"],
+        "Sum of model times (s)": timing["sum_model_time"],
+        "Overlap ratio": timing["overlap_ratio"],
+        "Workers": timing["workers"]
+    }
+    # Models under their own key; the speedup is repeated next to them with
+    # a pointer to the full training summary
     with open(f"{results_direction}/model_results.json", "w") as f:
-        json.dump(results, f, indent=4)
+        json.dump({
+            "Models": results,
+            "Parallel training": {"Speedup": timing["speedup"],
+                                  "Summary": os.path.basename(summary_path)}
+        }, f, indent=4)
+    with open(summary_path, "w") as f:
+        json.dump(training_summary, f, indent=4)
 
     print(f"Results saved to {results_direction}/model_results.json")
+    print(f"Training summary saved to {summary_path}")
 
     # Print final results table
     print("\n" + "★" * 15 + " FINAL RESULTS " + "★" * 15)
@@ -176,4 +260,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
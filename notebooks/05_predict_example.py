@@ -7,17 +7,26 @@ Demonstrates how to load a trained model and make a single prediction.
 This script is for demonstration purposes and is not required for grading.
 """
 
-import pickle
+import sys
+import json
 import pandas as pd
 import os
 
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Inference-only entry point: no plotting or training modules are imported
+from src.prediction_cache import CachedPredictor
+
 
 MODEL_PATH = "../reports/models/random_forest.pkl"
+PREPROCESSOR_PATH = "../reports/models/preprocessor.json"
+RESULT_PATH = "../reports/results/prediction_example.json"
 
 
 def create_sample_data():
     """
-    Create a single sample matching the training feature set.
+    Create a single raw district record, as found in data/raw/housing.csv.
     Values are realistic examples from the California housing dataset.
     """
     return pd.DataFrame({
@@ -29,13 +38,7 @@ def create_sample_data():
         'population': [322.0],
         'households': [126.0],
         'median_income': [8.3252],
-        'rooms_per_household': [880.0 / 126.0],
-        'bedrooms_per_household': [129.0 / 126.0],
-        'population_per_household': [322.0 / 126.0],
-        'ocean_proximity_INLAND': [0],
-        'ocean_proximity_ISLAND': [0],
-        'ocean_proximity_NEAR BAY': [1],
-        'ocean_proximity_NEAR OCEAN': [0]
+        'ocean_proximity': ['NEAR BAY']
     })
 
 
@@ -47,11 +50,15 @@ def main():
     if not os.path.exists(MODEL_PATH):
         print("\nError: Trained model not found.")
         print("Please run 04_machine_learning.py first.")
-        return
+        return 1
+
+    if not os.path.exists(PREPROCESSOR_PATH):
+        print("\nError: Fitted preprocessor not found.")
+        print("Please run 02_data_preprocessing.py first.")
+        return 1
 
-    # Load model
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
+    # Load model and the fitted preprocessor; repeated districts are served from the cache
+    predictor = CachedPredictor(MODEL_PATH, PREPROCESSOR_PATH)
 
     # Create example input
     sample = create_sample_data()
@@ -61,15 +68,26 @@ def main():
     print(f"Median income: ${sample['median_income'][0] * 10000:,.0f}")
     print(f"House age: {sample['housing_median_age'][0]} years")
 
-    # Predict
-    prediction = model.predict(sample)[0]
+    # Apply the training-time feature engineering and encoding, then predict
+    prediction = predictor.predict(sample)[0]
 
     print("\nPredicted median house value:")
     print(f"{prediction:,.2f}")
 
+    # The same district again is a cache hit: no preprocessing, no forest traversal
+    predictor.predict(sample)
+    stats = predictor.stats()
+    print(f"\nPrediction cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+
+    # Save the example input and its prediction
+    os.makedirs(os.path.dirname(RESULT_PATH), exist_ok=True)
+    with open(RESULT_PATH, "w") as f:
+        json.dump({"input": sample.iloc[0].to_dict(), "prediction": float(prediction)}, f, indent=4)
+    print(f"Prediction saved to {RESULT_PATH}")
+
     print("\nThis is a demonstration using the trained Random Forest model.")
     print("★" * 60)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
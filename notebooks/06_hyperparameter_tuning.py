@@ -0,0 +1,59 @@
+import sys
+import os
+import json
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_processing import load_data
+from src.models import prepare_matrix
+from src.tuning import tune_models
+
+# Paths to input data and output directories
+data_path = "../data/processed/housing_cleaned.csv"
+cache_direction = "../data/cache"
+results_direction = "../reports/results"
+
+
+def main():
+    """
+    Tunes the models with 5-fold cross-validation and successive halving
+    on the training split, and compares each winner with the hard-coded
+    configuration used in 04_machine_learning.py.
+    """
+    print("\n" + "★" * 40)
+    print("Hyperparameter Tuning")
+    print("★" * 40)
+
+    os.makedirs(results_direction, exist_ok=True)
+
+    if not os.path.exists(data_path):
+        print(f"\nError: Processed data not found at {data_path}")
+        return 1
+
+    # Tune on the training split only; the test split stays untouched.
+    # The split is a view of one contiguous array, which joblib memory-maps
+    # once for all cross-validation workers instead of pickling it per task.
+    df = load_data(data_path, cache_dir=cache_direction)
+    matrix = prepare_matrix(df)
+    print(f"\nTuning on {matrix.n_train:,} training samples (all cores)")
+
+    report = tune_models(matrix.X_train, matrix.y_train)
+
+    for name, r in report.items():
+        print(f"\n{name}")
+        for rnd in r["search"]["rounds"]:
+            print(f"   round {rnd['round']}: {rnd['candidates']:>3} candidates on "
+                  f"{rnd['rows']:>6,} rows  {rnd['compute_s']:8.1f}s  best R2 {rnd['best_r2']:.4f}")
+        print(f"   baseline {r['baseline_params']}: R2 {r['baseline']['r2']:.4f}")
+        print(f"   best     {r['best_params']}: R2 {r['best']['r2']:.4f}")
+        print(f"   gain {r['r2_gain']:+.4f} R2 for {r['compute_s']:.1f}s of compute")
+
+    with open(f"{results_direction}/tuning_results.json", "w") as f:
+        json.dump(report, f, indent=4, default=str)
+
+    print(f"\nResults saved to {results_direction}/tuning_results.json")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,60 +1,79 @@
 """
 Data Science with Python - Housing Price Prediction Project
 Source code modules for data processing, visualization, and machine learning.
+
+Submodules are imported on first use, so `import src` stays cheap and a
+process that only scores a saved model (see src.inference) never loads
+matplotlib, seaborn or the training code.
 """
 
+import importlib
+import importlib.util
+
 # Version information
 __version__ = "1.0.0"
 __author__ = "Your Name"
 __course__ = "Data Science with Python"
 
-# Import key functions to make them accessible from the package
-from .data_processing import (
-    load_data,
-    handle_missing_values,
-    remove_outliers,
-    create_features,
-    preprocess_data
-)
-
-from .visualization import (
-    plot_histogram,
-    plot_scatter,
-    plot_heatmap,
-    plot_boxplot,
-    plot_pairplot,
-    plot_violin,
-    save_plot
-)
-
-from .models import (
-    prepare_data,
-    train_linear_regression,
-    train_decision_tree,
-    train_random_forest
-)
-
-# Define what gets imported with "from src import *"
-__all__ = [
+# Key functions accessible from the package, mapped to the submodule defining them
+_EXPORTS = {
     # Data processing
-    'load_data',
-    'handle_missing_values',
-    'remove_outliers',
-    'create_features',
-    'preprocess_data',
+    'load_data': 'data_processing',
+    'handle_missing_values': 'data_processing',
+    'remove_outliers': 'data_processing',
+    'create_features': 'data_processing',
+    'preprocess_data': 'data_processing',
+    'preprocess_data_chunked': 'data_processing',
+    'preprocess_data_incremental': 'data_processing',
+    'chunked_drift_report': 'data_processing',
+    'HousingPreprocessor': 'preprocessor',
+    'compute_stats': 'stats',
+    'NeighborFeatures': 'spatial',
 
     # Visualization
-    'plot_histogram',
-    'plot_scatter',
-    'plot_heatmap',
-    'plot_boxplot',
-    'plot_pairplot',
-    'plot_violin',
-    'save_plot',
+    'plot_histogram': 'visualization',
+    'plot_scatter': 'visualization',
+    'plot_heatmap': 'visualization',
+    'plot_boxplot': 'visualization',
+    'plot_pairplot': 'visualization',
+    'plot_violin': 'visualization',
+    'plot_geographic': 'visualization',
+    'save_plot': 'visualization',
+    'FigureSpec': 'figures',
+    'build_figures': 'figures',
 
     # Models
-    'prepare_data',
-    'train_linear_regression',
-    'train_decision_tree',
-    'train_random_forest'
-]
\ No newline at end of file
+    'prepare_data': 'models',
+    'prepare_matrix': 'models',
+    'FeatureMatrix': 'feature_matrix',
+    'train_linear_regression': 'models',
+    'train_decision_tree': 'models',
+    'train_random_forest': 'models',
+    'train_hist_gradient_boosting': 'models',
+    'train_models_parallel': 'models',
+    'train_models_serial': 'models',
+    'IncrementalLinearRegression': 'models',
+    'train_incremental_linear_regression': 'models',
+
+    # Evaluation
+    'evaluate_predictions': 'evaluation',
+    'evaluate_model': 'evaluation'
+}
+
+# Define what gets imported with "from src import *"
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Importing the submodule behind an exported name (or the submodule itself) on first access."""
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    if not name.startswith('_') and importlib.util.find_spec(f'{__name__}.{name}') is not None:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
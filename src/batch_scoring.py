@@ -0,0 +1,134 @@
+"""
+Batch scoring of large CSV files of raw district records.
+
+The input is read in chunks, each chunk goes through the fitted
+preprocessor (the preprocess_data feature steps, without dropping rows) and
+the model in a worker process, and predictions are appended to the output in
+input order. At most max_in_flight chunks are queued or being scored at a
+time, so memory depends on the chunk size and worker count, not on the file
+size. The model is loaded once in the parent before the workers fork and is
+shared with them copy-on-write.
+
+Run from the project root:
+    python -m src.batch_scoring districts.csv predictions.csv \\
+        --model reports/models/random_forest.pkl --workers 8 --keep longitude latitude
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .inference import Predictor
+
+# Set in the parent before the pool starts, inherited by forked workers
+_predictor = None
+
+
+def _init_worker(model_path, preprocessor_path):
+    """Loading the model in workers that did not inherit it (spawn start method)."""
+    global _predictor
+    if _predictor is None:
+        _predictor = Predictor(model_path, preprocessor_path)
+
+
+def _score_chunk(chunk):
+    return _predictor.predict(chunk)
+
+
+def _write(output_path, chunk, predictions, keep_columns, header):
+    out = chunk[list(keep_columns)].copy() if keep_columns else pd.DataFrame(index=chunk.index)
+    out['prediction'] = predictions
+    out.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+
+
+def score_file(input_path, output_path, model_path, preprocessor_path=None, chunksize=50_000,
+               workers=None, max_in_flight=None, keep_columns=()):
+    """
+    Scoring every row of input_path and writing the predictions to output_path.
+
+    Parameters:
+    - input_path (str): CSV with the columns of data/raw/housing.csv (target optional)
+    - output_path (str): CSV written with keep_columns and a 'prediction' column
+    - model_path (str): .pkl model or .npz FlatForest
+    - preprocessor_path (str): Fitted preprocessor, by default next to the model
+    - chunksize (int): Rows per chunk sent to a worker
+    - workers (int): Worker processes, all cores by default; 1 scores in-process
+    - max_in_flight (int): Chunks submitted but not yet written, 2 per worker by default
+    - keep_columns (list): Input columns copied to the output, e.g. an id
+
+    Returns a summary with rows, chunks, seconds and rows_per_s.
+    """
+    global _predictor
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Data file not found at: {input_path}")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+
+    start = time.perf_counter()
+    _predictor = Predictor(model_path, preprocessor_path)
+    reader = pd.read_csv(input_path, chunksize=chunksize)
+    rows = chunks = 0
+
+    def write(chunk, predictions):
+        nonlocal rows, chunks
+        _write(output_path, chunk, predictions, keep_columns, header=chunks == 0)
+        rows += len(chunk)
+        chunks += 1
+
+    try:
+        if workers == 1:
+            for chunk in reader:
+                write(chunk, _score_chunk(chunk))
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker,
+                                     initargs=(model_path, preprocessor_path)) as pool:
+                in_flight = deque()
+                for chunk in reader:
+                    if len(in_flight) >= max_in_flight:
+                        done_chunk, future = in_flight.popleft()
+                        write(done_chunk, future.result())
+                    in_flight.append((chunk, pool.submit(_score_chunk, chunk)))
+                while in_flight:
+                    done_chunk, future = in_flight.popleft()
+                    write(done_chunk, future.result())
+    finally:
+        _predictor = None
+
+    if chunks == 0:
+        _write(output_path, pd.DataFrame(columns=list(keep_columns)), [], keep_columns, header=True)
+
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'chunks': chunks, 'workers': workers, 'seconds': seconds,
+            'rows_per_s': rows / seconds if seconds else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV of raw district records with a saved model.")
+    parser.add_argument('input', help="CSV with the columns of data/raw/housing.csv")
+    parser.add_argument('output', help="CSV to write the predictions to")
+    parser.add_argument('--model', default='reports/models/random_forest.pkl')
+    parser.add_argument('--preprocessor', default=None,
+                        help="Fitted preprocessor (default: preprocessor.json next to the model)")
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-in-flight', type=int, default=None)
+    parser.add_argument('--keep', nargs='*', default=[], help="Input columns to copy to the output")
+    args = parser.parse_args()
+
+    summary = score_file(args.input, args.output, args.model, args.preprocessor, args.chunksize,
+                         args.workers, args.max_in_flight, args.keep)
+    print(f"Scored {summary['rows']:,} rows in {summary['chunks']} chunks with "
+          f"{summary['workers']} worker(s): {summary['seconds']:.2f}s "
+          f"({summary['rows_per_s']:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
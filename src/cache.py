@@ -0,0 +1,132 @@
+"""
+Content-addressed columnar cache for loaded and processed datasets.
+
+Each entry is a directory of one .npy file per column plus a meta.json
+describing the frame. Entries are keyed by a hash of the source file contents
+and the parameters that produced the frame, so changing either one misses the
+cache. Loading memory-maps the arrays instead of parsing CSV text.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Bump when the layout of cache entries changes
+CACHE_VERSION = 1
+
+
+def file_digest(path, block_size=1 << 20):
+    """Hashing the contents of a file with SHA-256."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found at: {path}")
+    return digest.hexdigest()
+
+
+def cache_key(file_path, params):
+    """Building the cache key from the file contents and the producing parameters."""
+    payload = json.dumps({'file': file_digest(file_path), 'params': params,
+                          'version': CACHE_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def load_frame(cache_dir, key, mmap=True):
+    """
+    Loading a cached frame, or None when the entry does not exist.
+
+    With mmap=True numeric and bool columns are read-only memory maps, so only
+    the pages that are touched are read from disk.
+    """
+    entry = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for i, column in enumerate(meta['columns']):
+        values = np.load(os.path.join(entry, f'{i}.npy'), mmap_mode=mmap_mode)
+        if column['categories'] is not None:
+            values = pd.Categorical.from_codes(values, categories=column['categories'])
+            if column['dtype'] != 'category':
+                values = pd.Series(values).astype(column['dtype']).array
+        data[column['name']] = values
+
+    index = None
+    if meta['index']:
+        index = pd.Index(np.load(os.path.join(entry, 'index.npy'), mmap_mode=mmap_mode))
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def save_frame(df, cache_dir, key, source=None, params=None):
+    """
+    Writing a frame to the cache under key.
+
+    Object and categorical columns are stored as integer codes plus their
+    categories. Older entries built from the same source with the same
+    parameters are removed, since their inputs no longer exist.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        categories = None
+        if (isinstance(series.dtype, pd.CategoricalDtype)
+                or pd.api.types.is_object_dtype(series.dtype)
+                or pd.api.types.is_string_dtype(series.dtype)):
+            categorical = pd.Categorical(series)
+            categories = categorical.categories.tolist()
+            values = categorical.codes
+        else:
+            values = series.to_numpy()
+        np.save(os.path.join(tmp, f'{i}.npy'), values)
+        columns.append({'name': name, 'dtype': str(series.dtype), 'categories': categories})
+
+    has_index = not df.index.equals(pd.RangeIndex(len(df)))
+    if has_index:
+        np.save(os.path.join(tmp, 'index.npy'), df.index.to_numpy())
+
+    meta = {'columns': columns, 'index': has_index, 'rows': len(df),
+            'source': os.path.abspath(source) if source else None, 'params': params}
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=4)
+
+    if source is not None:
+        _remove_stale_entries(cache_dir, meta['source'], params, keep=key)
+
+    entry = os.path.join(cache_dir, key)
+    shutil.rmtree(entry, ignore_errors=True)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another process wrote the same entry in the meantime; keep theirs
+        if not os.path.exists(os.path.join(entry, 'meta.json')):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+    return entry
+
+
+def _remove_stale_entries(cache_dir, source, params, keep):
+    """Deleting entries that an earlier version of the same source produced."""
+    for name in os.listdir(cache_dir):
+        meta_path = os.path.join(cache_dir, name, 'meta.json')
+        if name == keep or name.startswith('.') or not os.path.exists(meta_path):
+            continue
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('source') == source and meta.get('params') == params:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
@@ -0,0 +1,201 @@
+"""
+Size-versus-accuracy compression of saved tree ensembles.
+
+Works on FlatForest node arrays after training, so no refit is needed:
+- prune_trees keeps a subset of the trees, the first n or a greedy selection
+  on held-out rows;
+- cap_depth turns the nodes at a given depth into leaves, predicting the
+  mean target their training samples already store, and drops everything
+  below them;
+- save_compact writes the arrays at a chosen precision to an .npz that
+  FlatForest.load (and therefore src.inference.Predictor) reads directly.
+
+Precision levels for save_compact:
+- 'float64': the arrays as trained
+- 'float32': float32 thresholds rounded down, which decide every float32
+  input exactly like the float64 ones, and float32 node values
+- 'float16': float16 thresholds and node values quantized to 16 bits over
+  their range; both are lossy
+
+Run from the project root:
+    python -m src.compression reports/models/random_forest.pkl reports/models/random_forest.npz \\
+        --trees 50 --max-depth 12 --precision float32
+"""
+
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+from .tree_engine import FlatForest
+
+PRECISIONS = ('float64', 'float32', 'float16')
+
+
+def _tree_of_node(forest):
+    """Tree index of every node; trees occupy consecutive node ranges."""
+    return np.searchsorted(forest.roots, np.arange(forest.n_nodes), side='right') - 1
+
+
+def node_depths(forest):
+    """Depth of every node reachable from a root, -1 for unreachable nodes."""
+    depth = np.full(forest.n_nodes, -1, dtype=np.int32)
+    frontier = forest.roots.astype(np.int64)
+    level = 0
+    while frontier.size:
+        depth[frontier] = level
+        internal = frontier[forest.left[frontier] != frontier]
+        frontier = np.concatenate([forest.left[internal], forest.right[internal]]).astype(np.int64)
+        level += 1
+    return depth
+
+
+def _subset(forest, keep):
+    """Keeping the nodes where keep is True, renumbering node ids and child pointers."""
+    new_id = np.cumsum(keep, dtype=np.int64) - 1
+    left = new_id[forest.left[keep]].astype(np.int32)
+    right = new_id[forest.right[keep]].astype(np.int32)
+    roots = new_id[forest.roots[keep[forest.roots]]].astype(np.int32)
+    subset = FlatForest(forest.feature[keep], forest.threshold[keep], left, right,
+                        forest.value[keep], roots,
+                        forest.max_depth, forest.feature_names)
+    subset.max_depth = int(node_depths(subset).max())
+    return subset
+
+
+def tree_predictions(forest, X):
+    """Prediction of every tree for every row, shape (rows, trees)."""
+    return forest.value[forest.leaves(X)]
+
+
+def prune_trees(forest, n_trees, X=None, y=None):
+    """
+    Keeping n_trees of the forest's trees.
+
+    Without data the first n_trees are kept; the trees of a random forest are
+    exchangeable, so this is an unbiased subsample. With held-out X and y,
+    trees are added greedily, each time the one that lowers the MSE of the
+    running average the most. Do not pass the test split, its scores would
+    then be optimistic.
+    """
+    if not 1 <= n_trees <= forest.n_trees:
+        raise ValueError(f"n_trees must be between 1 and {forest.n_trees}")
+    if X is None:
+        chosen = np.arange(n_trees)
+    else:
+        predictions = tree_predictions(forest, X)
+        y = np.asarray(y, dtype=np.float64)
+        total = np.zeros(len(y))
+        available = np.ones(forest.n_trees, dtype=bool)
+        chosen = []
+        for k in range(1, n_trees + 1):
+            errors = (((total[:, None] + predictions) / k - y[:, None]) ** 2).mean(axis=0)
+            errors[~available] = np.inf
+            best = int(np.argmin(errors))
+            chosen.append(best)
+            available[best] = False
+            total += predictions[:, best]
+        chosen = np.sort(chosen)
+    return _subset(forest, np.isin(_tree_of_node(forest), chosen))
+
+
+def cap_depth(forest, max_depth):
+    """Turning the nodes at max_depth into leaves and dropping the nodes below them."""
+    if max_depth < 0:
+        raise ValueError("max_depth must be non-negative")
+    depth = node_depths(forest)
+    cut = np.flatnonzero(depth == max_depth)
+    feature = forest.feature.copy()
+    threshold = forest.threshold.copy()
+    left = forest.left.copy()
+    right = forest.right.copy()
+    feature[cut] = 0
+    threshold[cut] = np.inf
+    left[cut] = cut
+    right[cut] = cut
+    capped = FlatForest(feature, threshold, left, right, forest.value, forest.roots,
+                        forest.max_depth, forest.feature_names)
+    return _subset(capped, (depth >= 0) & (depth <= max_depth))
+
+
+def _round_down(threshold, dtype):
+    """Casting thresholds to dtype, rounding down so x <= t never turns true for a cast t."""
+    cast = threshold.astype(dtype)
+    above = cast.astype(np.float64) > threshold
+    cast[above] = np.nextafter(cast[above], dtype(-np.inf))
+    return cast
+
+
+def save_compact(forest, path, precision='float32', compress=False):
+    """
+    Saving a FlatForest to a compact .npz readable by FlatForest.load.
+
+    Split features are stored as uint8 when there are at most 256, and
+    the arrays at the given precision (see the module docstring). compress
+    zlib-compresses the archive, for copying to other hosts: about half the
+    size, but loading decompresses every array and takes several times longer.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}, expected one of {PRECISIONS}")
+    n_features = int(forest.feature.max()) + 1
+    arrays = {
+        'feature': forest.feature.astype(np.uint8 if n_features <= 256 else np.int32),
+        'left': forest.left,
+        'right': forest.right,
+        'roots': forest.roots,
+        'max_depth': forest.max_depth,
+        'feature_names': np.array(forest.feature_names or [], dtype=str)
+    }
+    if precision == 'float64':
+        arrays['threshold'] = forest.threshold.astype(np.float64)
+        arrays['value'] = forest.value.astype(np.float64)
+    elif precision == 'float32':
+        arrays['threshold'] = _round_down(forest.threshold, np.float32)
+        arrays['value'] = forest.value.astype(np.float32)
+    else:
+        arrays['threshold'] = _round_down(forest.threshold, np.float16)
+        low, high = float(forest.value.min()), float(forest.value.max())
+        scale = (high - low) / np.iinfo(np.uint16).max or 1.0
+        arrays['value'] = np.round((forest.value - low) / scale).astype(np.uint16)
+        arrays['value_offset'] = low
+        arrays['value_scale'] = scale
+
+    (np.savez_compressed if compress else np.savez)(path, **arrays)
+
+
+def compress_model(model, n_trees=None, max_depth=None, X=None, y=None):
+    """Flattening a fitted tree model (or taking a FlatForest) and pruning and capping it."""
+    forest = model if isinstance(model, FlatForest) else FlatForest.from_sklearn(model)
+    if n_trees is not None and n_trees < forest.n_trees:
+        forest = prune_trees(forest, n_trees, X, y)
+    if max_depth is not None and max_depth < forest.max_depth:
+        forest = cap_depth(forest, max_depth)
+    return forest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress a saved tree model into a compact .npz.")
+    parser.add_argument('model', help="Pickled DecisionTreeRegressor/RandomForestRegressor or FlatForest .npz")
+    parser.add_argument('output', help=".npz file to write")
+    parser.add_argument('--trees', type=int, default=None, help="Number of trees to keep")
+    parser.add_argument('--max-depth', type=int, default=None, help="Depth to cap the trees at")
+    parser.add_argument('--precision', choices=PRECISIONS, default='float32')
+    parser.add_argument('--compress', action='store_true', help="Write a zlib-compressed .npz")
+    args = parser.parse_args()
+
+    if args.model.endswith('.npz'):
+        model = FlatForest.load(args.model)
+    else:
+        with open(args.model, 'rb') as f:
+            model = pickle.load(f)
+
+    forest = compress_model(model, args.trees, args.max_depth)
+    save_compact(forest, args.output, args.precision, compress=args.compress)
+    print(f"{forest.n_trees} trees, {forest.n_nodes:,} nodes, depth {forest.max_depth}, "
+          f"{args.precision}: {os.path.getsize(args.model) / 1e6:.1f} MB -> "
+          f"{os.path.getsize(args.output) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,139 @@
 """Data processing functions for housing price prediction."""
+import hashlib
+import json
+import os
+
 import pandas as pd
 import numpy as np
 
-def load_data(file_path):
-    """Loading dataset from CSV."""
+from .cache import cache_key, load_frame, save_frame
+from .instrumentation import instrument
+from .streaming import RowReservoir
+
+# Bump when the output of preprocess_data changes for the same parameters
+PREPROCESS_VERSION = 1
+
+OCEAN_PROXIMITY_CATEGORIES = ['<1H OCEAN', 'INLAND', 'ISLAND', 'NEAR BAY', 'NEAR OCEAN']
+
+# Explicit dtypes for typed loading. float32 keeps ~7 significant digits, enough
+# for coordinates to 2 decimals, incomes to 4 decimals and counts/prices below 2**24.
+SCHEMA = {
+    'longitude': 'float32',
+    'latitude': 'float32',
+    'housing_median_age': 'float32',
+    'total_rooms': 'float32',
+    'total_bedrooms': 'float32',
+    'population': 'float32',
+    'households': 'float32',
+    'median_income': 'float32',
+    'median_house_value': 'float32',
+    'rooms_per_household': 'float32',
+    'bedrooms_per_household': 'float32',
+    'population_per_household': 'float32',
+    'ocean_proximity': pd.CategoricalDtype(OCEAN_PROXIMITY_CATEGORIES)
+}
+
+
+@instrument
+def load_data(file_path, cache_dir=None, typed=False, engine=None):
+    """
+    Loading dataset from CSV.
+
+    Parameters:
+    - file_path (str): CSV file to read
+    - cache_dir (str): If set, the parsed frame is stored as memory-mapped
+      columns keyed by the file contents, and later calls skip CSV parsing
+    - typed (bool): Read with SCHEMA (float32 numerics, categorical
+      ocean_proximity) instead of inferring float64 and strings
+    - engine (str): pandas parser engine, e.g. 'pyarrow' when installed
+    """
+    params = {'stage': 'load_data', 'typed': typed}
+    if cache_dir is not None:
+        key = cache_key(file_path, params)
+        df = load_frame(cache_dir, key)
+        if df is not None:
+            return df
+
+    options = {}
+    if typed:
+        options['dtype'] = SCHEMA
+    if engine is not None:
+        options['engine'] = engine
+
     try:
-        return pd.read_csv(file_path)
+        df = pd.read_csv(file_path, **options)
     except FileNotFoundError:
         raise FileNotFoundError(f"Data file not found at: {file_path}")
 
+    if cache_dir is not None:
+        save_frame(df, cache_dir, key, source=file_path, params=params)
+    return df
+
 
+@instrument
 def handle_missing_values(df):
     """Filling missing values with median."""
     df = df.copy()
     df['total_bedrooms'] = df['total_bedrooms'].fillna(df['total_bedrooms'].median())
     return df
 
-def remove_outliers(df):
-    """Removing outliers from features (not target)."""
-    df = df.copy()
+def _feature_columns(df, target_col='median_house_value'):
+    """Listing the numeric columns that outlier removal is applied to."""
     numeric_cols = df.select_dtypes(include=np.number).columns
-    numeric_cols = [col for col in numeric_cols if col != 'median_house_value']
+    return [col for col in numeric_cols if col != target_col]
 
-    for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        df = df[(df[col] >= Q1 - 1.5 * IQR) & (df[col] <= Q3 + 1.5 * IQR)]
 
-    return df
+@instrument
+def compute_outlier_bounds(df, mode='sequential'):
+    """
+    Computing the 1.5 x IQR bounds of every numeric feature (not target).
+
+    Parameters:
+    - df (pd.DataFrame): Input dataset
+    - mode (str): 'sequential' computes each column's quartiles on the rows that
+      survive the previous columns, exactly like the original column-by-column
+      filter. 'independent' computes all quartiles on the full data in one call.
+    """
+    cols = _feature_columns(df)
+    values = df[cols].to_numpy(dtype=np.float64)
+
+    if mode == 'independent':
+        Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    elif mode == 'sequential':
+        Q1 = np.full(len(cols), np.nan)
+        Q3 = np.full(len(cols), np.nan)
+        mask = np.ones(len(values), dtype=bool)
+        for j in range(len(cols)):
+            column = values[mask, j]
+            if np.isnan(column).all():
+                mask[:] = False
+                continue
+            Q1[j], Q3[j] = np.nanquantile(column, [0.25, 0.75])
+            IQR = Q3[j] - Q1[j]
+            mask &= (values[:, j] >= Q1[j] - 1.5 * IQR) & (values[:, j] <= Q3[j] + 1.5 * IQR)
+    else:
+        raise ValueError(f"Unknown outlier mode '{mode}', expected 'sequential' or 'independent'")
+
+    IQR = Q3 - Q1
+    return {col: (float(lo), float(hi)) for col, lo, hi in zip(cols, Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)}
+
+
+def outlier_mask(df, bounds):
+    """Marking the rows that lie inside the bounds of every column."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, (lower, upper) in bounds.items():
+        values = df[col].to_numpy()
+        mask &= (values >= lower) & (values <= upper)
+    return mask
+
+
+@instrument
+def remove_outliers(df, mode='sequential'):
+    """Removing outliers from features (not target) with one mask and a single take."""
+    mask = outlier_mask(df, compute_outlier_bounds(df, mode))
+    return df.take(np.flatnonzero(mask))
 
+@instrument
 def create_features(df):
     """Creating new features from existing data."""
     df = df.copy()
@@ -41,15 +145,33 @@ def create_features(df):
 
     return df
 
-def preprocess_data(file_path, save_path=None):
-    """Completing preprocessing pipeline. Load data"""
-    df = load_data(file_path)
+@instrument
+def preprocess_data(file_path, save_path=None, outlier_mode='sequential', cache_dir=None,
+                    typed=False):
+    """
+    Completing preprocessing pipeline. Load data
+
+    With cache_dir set, the processed frame is cached under a hash of the raw
+    file and the preprocessing parameters, and reused until either changes.
+    With typed=True the data is loaded with SCHEMA (see load_data).
+    """
+    params = {'stage': 'preprocess_data', 'outlier_mode': outlier_mode,
+              'typed': typed, 'version': PREPROCESS_VERSION}
+    if cache_dir is not None:
+        key = cache_key(file_path, params)
+        df = load_frame(cache_dir, key)
+        if df is not None:
+            if save_path:
+                df.to_csv(save_path, index=False)
+            return df
+
+    df = load_data(file_path, typed=typed)
 
     # Handle missing values
     df = handle_missing_values(df)
 
     # Remove outliers
-    df = remove_outliers(df)
+    df = remove_outliers(df, mode=outlier_mode)
 
     # Create features
     df = create_features(df)
@@ -60,4 +182,295 @@ def preprocess_data(file_path, save_path=None):
     if save_path:
         df.to_csv(save_path, index=False)
 
-    return df
\ No newline at end of file
+    if cache_dir is not None:
+        save_frame(df, cache_dir, key, source=file_path, params=params)
+
+    return df
+
+
+def _encode_ocean_proximity(df, categories):
+    """One-hot encoding ocean_proximity against a fixed category list."""
+    df = df.copy()
+    df['ocean_proximity'] = pd.Categorical(df['ocean_proximity'], categories=categories)
+    return pd.get_dummies(df, columns=['ocean_proximity'], drop_first=True)
+
+
+def _scan_statistics(chunks, reservoir=None, categories=None, sample_size=200_000, random_state=42):
+    """Feeding chunks of raw rows into a row reservoir and the ocean_proximity vocabulary."""
+    categories = set(categories or ())
+    for chunk in chunks:
+        if reservoir is None:
+            numeric_cols = list(chunk.select_dtypes(include=np.number).columns)
+            reservoir = RowReservoir(numeric_cols, size=sample_size, random_state=random_state)
+        reservoir.update(chunk)
+        categories.update(chunk['ocean_proximity'].dropna().unique())
+    return reservoir, categories
+
+
+def _sample_statistics(reservoir, categories):
+    """Computing the preprocessing statistics from a reservoir sample."""
+    sample = reservoir.to_frame()
+    median = sample['total_bedrooms'].median()
+    sample['total_bedrooms'] = sample['total_bedrooms'].fillna(median)
+
+    return {
+        'median_total_bedrooms': float(median),
+        'bounds': compute_outlier_bounds(sample),
+        'categories': sorted(categories),
+        'rows_seen': reservoir.rows_seen,
+        'exact': reservoir.is_exact
+    }
+
+
+def _transform_chunk(chunk, stats):
+    """Imputing, filtering, engineering and encoding one chunk with fixed statistics."""
+    chunk = chunk.copy()
+    chunk['total_bedrooms'] = chunk['total_bedrooms'].fillna(stats['median_total_bedrooms'])
+    chunk = chunk[outlier_mask(chunk, stats['bounds'])]
+    chunk = create_features(chunk)
+    return _encode_ocean_proximity(chunk, stats['categories'])
+
+
+def _write_processed(chunks, save_path, stats, append=False):
+    """Transforming chunks with fixed statistics and writing them to save_path. Returns rows in and out."""
+    rows_in = rows_out = 0
+    for chunk in chunks:
+        rows_in += len(chunk)
+        chunk = _transform_chunk(chunk, stats)
+        chunk.to_csv(save_path, mode='a' if append else 'w', header=not append, index=False)
+        rows_out += len(chunk)
+        append = True
+    return rows_in, rows_out
+
+
+@instrument
+def fit_chunked_statistics(file_path, chunksize=100_000, sample_size=200_000, random_state=42):
+    """
+    First pass of the chunked pipeline: estimating preprocessing statistics.
+
+    Streams the CSV once and keeps a bounded random sample of the numeric
+    columns, from which the total_bedrooms median and the IQR bounds of
+    remove_outliers are computed. The ocean_proximity vocabulary is collected
+    exactly. The statistics are exact whenever the file has at most
+    `sample_size` rows.
+
+    Returns a dict with 'median_total_bedrooms', 'bounds', 'categories',
+    'rows_seen' and 'exact'.
+    """
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunksize)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+
+    reservoir, categories = _scan_statistics(reader, sample_size=sample_size,
+                                             random_state=random_state)
+    if reservoir is None:
+        raise ValueError(f"No rows found in: {file_path}")
+    return _sample_statistics(reservoir, categories)
+
+
+@instrument
+def preprocess_data_chunked(file_path, save_path, chunksize=100_000, sample_size=200_000,
+                            random_state=42):
+    """
+    Out-of-core version of preprocess_data for CSVs larger than memory.
+
+    The first pass estimates the statistics with fit_chunked_statistics. The
+    second pass imputes, filters, engineers features, one-hot encodes and
+    appends each chunk to `save_path`, so only one chunk is held at a time.
+
+    Returns the fitted statistics together with 'rows_in' and 'rows_out'.
+    """
+    stats = fit_chunked_statistics(file_path, chunksize, sample_size, random_state)
+    rows_in, rows_out = _write_processed(pd.read_csv(file_path, chunksize=chunksize), save_path, stats)
+    stats.update(rows_in=rows_in, rows_out=rows_out)
+    return stats
+
+
+def _fingerprint(file_path, length, block_size=1 << 20):
+    """
+    Hashing the first and the last block_size bytes of the first length bytes of a file.
+
+    Enough to notice a file that was replaced, rewritten or truncated and
+    regrown, without rereading everything already processed on each run.
+    """
+    digest = hashlib.sha256(str(length).encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(min(block_size, length)))
+        if length > block_size:
+            f.seek(max(block_size, length - block_size))
+            digest.update(f.read(length - f.tell()))
+    return digest.hexdigest()
+
+
+def statistics_drift(old, new):
+    """
+    Measuring how far the statistics moved, relative to the width of the old bounds.
+
+    Returns, for every bounded column, the larger shift of its two outlier
+    bounds and, under 'median_total_bedrooms', the shift of the imputation
+    median, each as a fraction of the column's old lower-to-upper range.
+    """
+    drift = {}
+    for col, (lo, hi) in old['bounds'].items():
+        width = max(hi - lo, 1e-12)
+        new_lo, new_hi = new['bounds'][col]
+        drift[col] = max(abs(new_lo - lo), abs(new_hi - hi)) / width
+    lo, hi = old['bounds']['total_bedrooms']
+    drift['median_total_bedrooms'] = (abs(new['median_total_bedrooms'] - old['median_total_bedrooms'])
+                                      / max(hi - lo, 1e-12))
+    return drift
+
+
+@instrument
+def preprocess_data_incremental(file_path, save_path, state_path, chunksize=100_000,
+                                sample_size=200_000, drift_tolerance=0.05, random_state=42):
+    """
+    Preprocessing only the rows appended to file_path since the previous run.
+
+    The state file records the byte offset processed so far, a fingerprint of
+    those bytes, the statistics the processed rows were transformed with and, next
+    to it as .npz, the row reservoir they were estimated from. When the file
+    only grew, the new tail is read from the stored offset, fed to the
+    reservoir and the category set, and transformed with the stored
+    statistics before being appended to save_path. Everything is recomputed
+    (as preprocess_data_chunked would) when there is no usable state, the
+    processed bytes changed, the parameters changed, a new ocean_proximity
+    category appears, or any outlier bound or the median moved by more than
+    drift_tolerance of its column's bound range.
+
+    Like preprocess_data_chunked, the statistics are exact only while the
+    file has at most sample_size rows. Above that they are estimated from
+    the reservoir sample, so the median and the IQR bounds can differ slightly
+    from preprocess_data's; stats['exact'] says which applies.
+
+    Returns a report with 'mode' ('full', 'incremental' or 'unchanged'),
+    'reason', 'rows_processed', 'rows_skipped', 'rows_appended', 'rows_in',
+    'rows_out', 'drift', the raw 'columns' and the statistics in use, with
+    'exact' and 'rows_seen' (the rows they were estimated from).
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+    reservoir_path = os.path.splitext(state_path)[0] + '.npz'
+    os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+    params = {'sample_size': sample_size, 'random_state': random_state,
+              'version': PREPROCESS_VERSION, 'state_version': 2}
+    size = os.path.getsize(file_path)
+
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        state = None
+
+    if state is None:
+        reason = 'no previous state'
+    elif state['params'] != params:
+        reason = 'parameters changed'
+    elif not os.path.exists(save_path) or not os.path.exists(reservoir_path):
+        reason = 'processed output missing'
+    elif size < state['offset'] or _fingerprint(file_path, state['offset']) != state['digest']:
+        reason = 'processed rows changed'
+    elif size > state['offset'] and not state['ends_with_newline']:
+        reason = 'last processed line was extended'
+    else:
+        reason = None
+
+    stats = drift = None
+    if reason is None and size == state['offset']:
+        stats = state['stats']
+        report = {'mode': 'unchanged', 'reason': 'no new rows', 'rows_processed': 0,
+                  'rows_skipped': state['rows_in'], 'rows_appended': 0}
+        rows_in, rows_out = state['rows_in'], state['rows_out']
+    elif reason is None:
+        def tail():
+            with open(file_path, 'rb') as f:
+                f.seek(state['offset'])
+                yield from pd.read_csv(f, header=None, names=state['columns'], chunksize=chunksize)
+
+        # First pass over the new rows only: update the sketches, check the drift
+        reservoir, categories = _scan_statistics(tail(), reservoir=RowReservoir.load(reservoir_path),
+                                                 categories=state['stats']['categories'])
+        updated = _sample_statistics(reservoir, categories)
+        drift = statistics_drift(state['stats'], updated)
+        if set(categories) != set(state['stats']['categories']):
+            reason = 'new ocean_proximity category'
+        elif max(drift.values()) > drift_tolerance:
+            reason = f"statistics drifted by {max(drift.values()):.1%} (tolerance {drift_tolerance:.1%})"
+        else:
+            # Second pass: transform with the statistics the earlier rows used
+            stats = state['stats']
+            rows_new, rows_appended = _write_processed(tail(), save_path, stats, append=True)
+            reservoir.save(reservoir_path)
+            report = {'mode': 'incremental', 'reason': 'rows appended', 'rows_processed': rows_new,
+                      'rows_skipped': state['rows_in'], 'rows_appended': rows_appended}
+            rows_in, rows_out = state['rows_in'] + rows_new, state['rows_out'] + rows_appended
+
+    if stats is None:
+        reservoir, categories = _scan_statistics(pd.read_csv(file_path, chunksize=chunksize),
+                                                 sample_size=sample_size, random_state=random_state)
+        if reservoir is None:
+            raise ValueError(f"No rows found in: {file_path}")
+        stats = _sample_statistics(reservoir, categories)
+
+        rows_in, rows_out = _write_processed(pd.read_csv(file_path, chunksize=chunksize),
+                                             save_path, stats)
+        reservoir.save(reservoir_path)
+        report = {'mode': 'full', 'reason': reason, 'rows_processed': rows_in,
+                  'rows_skipped': 0, 'rows_appended': rows_out}
+
+    with open(file_path, 'rb') as f:
+        f.seek(max(size - 1, 0))
+        ends_with_newline = size == 0 or f.read(1) == b'\n'
+    state = {
+        'params': params,
+        'offset': size,
+        'digest': _fingerprint(file_path, size),
+        'ends_with_newline': ends_with_newline,
+        'columns': list(pd.read_csv(file_path, nrows=0).columns),
+        'stats': {key: stats[key] for key in ('median_total_bedrooms', 'bounds', 'categories',
+                                              'exact', 'rows_seen')},
+        'rows_in': rows_in,
+        'rows_out': rows_out
+    }
+    with open(state_path, 'w') as f:
+        json.dump(state, f, indent=4)
+
+    report.update(rows_in=rows_in, rows_out=rows_out, drift=drift, columns=state['columns'],
+                  stats=state['stats'])
+    return report
+
+
+def chunked_drift_report(file_path, chunksize=100_000, sample_size=200_000, random_state=42):
+    """
+    Comparing the chunked statistics against the exact in-memory pipeline.
+
+    Only meant for validation on files that still fit in memory. Reports the
+    absolute difference of the median and of every outlier bound, the number
+    of rows each path keeps, and the encoded columns that differ.
+    """
+    stats = fit_chunked_statistics(file_path, chunksize, sample_size, random_state)
+
+    exact = preprocess_data(file_path)
+    df = handle_missing_values(load_data(file_path))
+    exact_median = float(df['total_bedrooms'].median())
+    exact_bounds = compute_outlier_bounds(df)
+
+    # Rows the chunked pass would keep with its own statistics
+    df = load_data(file_path)
+    df['total_bedrooms'] = df['total_bedrooms'].fillna(stats['median_total_bedrooms'])
+    mask = outlier_mask(df, stats['bounds'])
+
+    chunked_cols = create_features(_encode_ocean_proximity(df.head(0), stats['categories'])).columns
+
+    return {
+        'exact_sample': stats['exact'],
+        'median_drift': abs(stats['median_total_bedrooms'] - exact_median),
+        'bound_drift': {
+            col: (float(abs(stats['bounds'][col][0] - lo)), float(abs(stats['bounds'][col][1] - hi)))
+            for col, (lo, hi) in exact_bounds.items()
+        },
+        'rows_exact': len(exact),
+        'rows_chunked': int(mask.sum()),
+        'column_mismatch': sorted(set(chunked_cols) ^ set(exact.columns))
+    }
@@ -0,0 +1,142 @@
+"""
+Single-pass evaluation of regression predictions with bounded memory.
+
+R², MSE, RMSE and MAE come from running sums, residual quantiles from a
+bounded reservoir sample, and confidence intervals from a Poisson bootstrap
+accumulated chunk by chunk, so predictions can be scored as they are produced.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .streaming import RowReservoir
+
+RESIDUAL_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+class StreamingEvaluator:
+    """
+    Accumulating regression metrics over chunks of (y_true, y_pred).
+
+    Parameters:
+    - n_bootstrap (int): Bootstrap replicates for confidence intervals, 0 to skip
+    - sample_size (int): Residuals kept for the quantile estimates (exact below this)
+    - block_size (int): Rows per bootstrap weight block, bounds the
+      n_bootstrap x block_size weight matrix
+    - random_state (int): Seed for the residual sample and the bootstrap weights
+    """
+
+    def __init__(self, n_bootstrap=0, sample_size=100_000, block_size=8192, random_state=42):
+        self.n = 0
+        self.sum_sq_error = 0.0
+        self.sum_abs_error = 0.0
+        self.mean_y = 0.0
+        self.m2_y = 0.0
+        self.n_bootstrap = n_bootstrap
+        self.block_size = block_size
+        self._rng = np.random.default_rng(random_state)
+        self._residuals = RowReservoir(['residual'], size=sample_size, random_state=random_state)
+        # Per replicate: sum of weights, w*y, w*y^2, w*e^2, w*|e|
+        self._boot = np.zeros((5, n_bootstrap))
+
+    def update(self, y_true, y_pred):
+        """Adding one chunk of targets and predictions."""
+        y = np.asarray(y_true, dtype=np.float64)
+        error = y - np.asarray(y_pred, dtype=np.float64)
+        n = len(y)
+        if n == 0:
+            return self
+
+        # Chan et al. merge of the target's mean and sum of squared deviations
+        chunk_mean = y.mean()
+        chunk_m2 = np.sum((y - chunk_mean) ** 2)
+        delta = chunk_mean - self.mean_y
+        total = self.n + n
+        self.m2_y += chunk_m2 + delta ** 2 * self.n * n / total
+        self.mean_y += delta * n / total
+        self.n = total
+
+        self.sum_sq_error += np.sum(error ** 2)
+        self.sum_abs_error += np.sum(np.abs(error))
+        self._residuals.update(pd.DataFrame({'residual': error}))
+
+        if self.n_bootstrap:
+            columns = np.stack([np.ones(n), y, y ** 2, error ** 2, np.abs(error)])
+            for start in range(0, n, self.block_size):
+                block = columns[:, start:start + self.block_size]
+                weights = self._rng.poisson(1.0, (self.n_bootstrap, block.shape[1]))
+                self._boot += block @ weights.T
+        return self
+
+    @staticmethod
+    def _metrics(n, sse, sae, sst):
+        mse = sse / n
+        return {
+            'r2': 1.0 - sse / sst if sst > 0 else float('nan'),
+            'mse': mse,
+            'rmse': np.sqrt(mse),
+            'mae': sae / n
+        }
+
+    def result(self, confidence=0.95):
+        """Returning the metrics, residual quantiles and, with bootstrap, confidence intervals."""
+        if self.n == 0:
+            raise ValueError("No predictions to evaluate")
+
+        results = self._metrics(self.n, self.sum_sq_error, self.sum_abs_error, self.m2_y)
+        residuals = self._residuals.to_frame()['residual']
+        results['residual_quantiles'] = {q: float(residuals.quantile(q)) for q in RESIDUAL_QUANTILES}
+        results['n'] = self.n
+
+        if self.n_bootstrap:
+            w, wy, wyy, we2, wae = self._boot
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mse = we2 / w
+                replicates = {
+                    'r2': 1.0 - we2 / (wyy - wy ** 2 / w),
+                    'mse': mse,
+                    'rmse': np.sqrt(mse),
+                    'mae': wae / w
+                }
+            alpha = (1 - confidence) / 2
+            results['ci'] = {
+                metric: tuple(float(v) for v in np.nanquantile(values, [alpha, 1 - alpha]))
+                for metric, values in replicates.items()
+            }
+            results['confidence'] = confidence
+        return results
+
+
+def evaluate_predictions(y_true, y_pred, chunk_size=100_000, n_bootstrap=0, confidence=0.95,
+                         random_state=42):
+    """
+    Computing R², MSE, RMSE, MAE and residual quantiles in one pass over the predictions.
+
+    With n_bootstrap > 0 the result also holds percentile confidence intervals
+    under 'ci'.
+    """
+    evaluator = StreamingEvaluator(n_bootstrap=n_bootstrap, random_state=random_state)
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    for start in range(0, len(y_true), chunk_size):
+        evaluator.update(y_true[start:start + chunk_size], y_pred[start:start + chunk_size])
+    return evaluator.result(confidence)
+
+
+def evaluate_model(model, X, y, chunk_size=100_000, n_bootstrap=0, confidence=0.95,
+                   keep_predictions=True, random_state=42):
+    """
+    Predicting X chunk by chunk and scoring each chunk as it is produced.
+
+    With keep_predictions=False only the metrics are kept, so memory does not
+    grow with the number of rows. Returns (metrics, predictions or None).
+    """
+    evaluator = StreamingEvaluator(n_bootstrap=n_bootstrap, random_state=random_state)
+    y = np.asarray(y)
+    predictions = []
+    for start in range(0, len(X), chunk_size):
+        y_pred = model.predict(X[start:start + chunk_size])
+        evaluator.update(y[start:start + chunk_size], y_pred)
+        if keep_predictions:
+            predictions.append(y_pred)
+    return evaluator.result(confidence), np.concatenate(predictions) if keep_predictions else None
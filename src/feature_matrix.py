@@ -0,0 +1,164 @@
+"""
+Contiguous feature matrix with index-based train/test splits.
+
+The processed frame is copied once, column by column, into a single
+C-contiguous array with the training rows first and the test rows after,
+casting the boolean one-hot columns on the way. The splits are then slices:
+X_train and X_test are views, and frames() wraps the views in DataFrames
+without copying, so the trainers keep their feature names.
+
+share() moves the arrays into multiprocessing shared memory. A shared
+FeatureMatrix pickles to the block names only, and unpickling in a worker
+attaches to the same memory, so process pools send a few bytes per task
+instead of a copy of the data.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Arrays placed in shared memory by share()
+_ARRAYS = ('X', 'y', 'index')
+
+
+class FeatureMatrix:
+    """
+    Features, target and row labels in split order.
+
+    Attributes:
+    - X (ndarray): (rows, features) C-contiguous matrix, training rows first
+    - y (ndarray): float64 target
+    - index (ndarray): Labels of the rows in the source frame
+    - feature_names (list): Column names of X
+    - n_train (int): Number of training rows
+    """
+
+    def __init__(self, X, y, index, feature_names, n_train):
+        self.X = X
+        self.y = y
+        self.index = index
+        self.feature_names = list(feature_names)
+        self.n_train = int(n_train)
+        self._blocks = {}
+        self._owner = False
+
+    @classmethod
+    def from_frame(cls, df, target_col, train_rows, test_rows, dtype=np.float64):
+        """
+        Copying the features of df into one matrix, train_rows then test_rows.
+
+        Parameters:
+        - train_rows, test_rows (array): Row positions in df
+        - dtype: float32 or float64
+        """
+        order = np.concatenate([train_rows, test_rows])
+        feature_names = [col for col in df.columns if col != target_col]
+        X = np.empty((len(order), len(feature_names)), dtype=dtype)
+        for j, col in enumerate(feature_names):
+            X[:, j] = df[col].to_numpy()[order]
+        y = df[target_col].to_numpy(dtype=np.float64)[order]
+        return cls(X, y, df.index.to_numpy()[order], feature_names, len(train_rows))
+
+    @property
+    def n_rows(self):
+        return len(self.X)
+
+    @property
+    def train_rows(self):
+        return np.arange(self.n_train)
+
+    @property
+    def test_rows(self):
+        return np.arange(self.n_train, self.n_rows)
+
+    @property
+    def X_train(self):
+        return self.X[:self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.n_train]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train:]
+
+    def frames(self):
+        """Returning X_train, X_test, y_train, y_test as pandas objects over views of the arrays."""
+        split = slice(None, self.n_train), slice(self.n_train, None)
+        X_train, X_test = (pd.DataFrame(self.X[s], columns=self.feature_names,
+                                        index=self.index[s], copy=False) for s in split)
+        y_train, y_test = (pd.Series(self.y[s], index=self.index[s], copy=False) for s in split)
+        return X_train, X_test, y_train, y_test
+
+    @property
+    def shared(self):
+        return bool(self._blocks)
+
+    def share(self):
+        """Moving the arrays into shared memory, once. Returns self."""
+        if self.shared:
+            return self
+        for name in _ARRAYS:
+            array = getattr(self, name)
+            if array.dtype.hasobject:
+                continue
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            shared[...] = array
+            self._blocks[name] = block
+            setattr(self, name, shared)
+        self._owner = True
+        return self
+
+    def close(self):
+        """
+        Detaching from shared memory; the process that called share() also frees it.
+
+        The arrays are copied back first so the object stays usable. Views
+        taken while shared (e.g. from frames()) keep their mapping alive until
+        they are garbage collected.
+        """
+        if not self.shared:
+            return
+        for name in self._blocks:
+            setattr(self, name, np.array(getattr(self, name)))
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass
+            if self._owner:
+                block.unlink()
+        self._blocks = {}
+        self._owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        state = {'feature_names': self.feature_names, 'n_train': self.n_train,
+                 'arrays': {name: getattr(self, name) for name in _ARRAYS if name not in self._blocks},
+                 'blocks': {name: (block.name, getattr(self, name).shape, getattr(self, name).dtype.str)
+                            for name, block in self._blocks.items()}}
+        return state
+
+    def __setstate__(self, state):
+        self.feature_names = state['feature_names']
+        self.n_train = state['n_train']
+        self._blocks = {}
+        self._owner = False
+        for name, array in state['arrays'].items():
+            setattr(self, name, array)
+        for name, (block_name, shape, dtype) in state['blocks'].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            self._blocks[name] = block
+            setattr(self, name, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
@@ -0,0 +1,259 @@
+"""
+Declarative, cache-aware figure building.
+
+Every figure is declared as a FigureSpec: the output file, a plot function,
+the frame and columns it reads and its parameters. build_figures hashes those
+inputs, reuses figures whose hash matches the manifest stored next to them, and
+renders the rest in a process pool with the non-interactive Agg backend. The
+code part of the hash covers the plot function's source file and, transitively,
+those of the project functions and modules it calls, so editing a helper in
+another module invalidates the figures drawn through it.
+
+Usage:
+    specs = [FigureSpec("01_price_distribution.png", plot_histogram, df,
+                        columns=["median_house_value"],
+                        params={"column": "median_house_value", "title": "Prices"})]
+    summary = build_figures(specs, "reports/figures")
+    print(summary["rendered"], summary["reused"])
+"""
+
+import fcntl
+import hashlib
+import inspect
+import json
+import os
+import sysconfig
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .cache import file_digest
+from .instrumentation import instrument
+
+# Bump when the way figures are keyed or saved changes
+FIGURES_VERSION = 2
+MANIFEST_NAME = '.figures_manifest.json'
+# Backends that draw without a display, so figures can be rendered in the caller's process
+NON_INTERACTIVE_BACKENDS = ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+# Standard library and installed packages, whose code is not hashed into figure keys
+_LIBRARY_PATHS = tuple(sorted({
+    os.path.realpath(path) + os.sep for name, path in sysconfig.get_paths().items()
+    if name in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+}))
+
+
+def _global_names(code):
+    """Global names read by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def code_files(func):
+    """
+    Source files of func and of the project functions, classes and modules it refers to.
+
+    Follows the globals of every project function found, so a wrapper defined
+    in a script also covers the module of the helper it calls. Standard
+    library and installed packages are skipped.
+    """
+    files, seen = set(), set()
+    stack = [func]
+    while stack:
+        obj = inspect.unwrap(stack.pop())
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        try:
+            source = inspect.getsourcefile(obj)
+        except TypeError:
+            continue
+        if source is None or os.path.realpath(source).startswith(_LIBRARY_PATHS):
+            continue
+        files.add(source)
+        if inspect.isfunction(obj):
+            for name in _global_names(obj.__code__):
+                value = obj.__globals__.get(name)
+                if inspect.isfunction(value) or inspect.isclass(value) or inspect.ismodule(value):
+                    stack.append(value)
+    return sorted(files)
+
+
+class FigureSpec:
+    """
+    One figure and the inputs it depends on.
+
+    Parameters:
+    - filename (str): Output file name inside the figures directory
+    - plot (callable): Module-level function called as plot(data, **params), returning a Figure
+    - data (pd.DataFrame): Frame the figure is drawn from
+    - columns (list): Columns of data the plot reads, None for all of them
+    - params (dict): Keyword arguments for plot, JSON-serializable
+    - dpi (int), bbox_inches (str): Passed to savefig
+    """
+
+    def __init__(self, filename, plot, data, columns=None, params=None, dpi=100,
+                 bbox_inches='tight'):
+        self.filename = filename
+        self.plot = plot
+        self.data = data
+        self.columns = list(columns) if columns is not None else list(data.columns)
+        self.params = params or {}
+        self.dpi = dpi
+        self.bbox_inches = bbox_inches
+
+    def key(self, column_digest):
+        """Hashing the input columns, parameters and the source files of the plot code."""
+        payload = json.dumps({
+            'version': FIGURES_VERSION,
+            'plot': f'{self.plot.__module__}.{self.plot.__qualname__}',
+            'code': sorted(file_digest(source) for source in code_files(self.plot)),
+            'columns': [[c, column_digest(self.data, c)] for c in self.columns],
+            'params': self.params,
+            'save': [self.dpi, self.bbox_inches]
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _column_hasher():
+    """Returning a column digest function that hashes each (frame, column) once."""
+    digests = {}
+
+    def column_digest(df, column):
+        key = (id(df), column)
+        if key not in digests:
+            series = df[column]
+            values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            digest = hashlib.sha256(values.tobytes())
+            digest.update(str(series.dtype).encode())
+            digests[key] = digest.hexdigest()
+        return digests[key]
+
+    return column_digest
+
+
+def _use_agg():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _renders_in_process():
+    """Whether this process's matplotlib backend already draws without a display."""
+    import matplotlib
+    return matplotlib.get_backend().lower() in NON_INTERACTIVE_BACKENDS
+
+
+def _render(plot, data, params, path, dpi, bbox_inches):
+    """Drawing one figure and saving it; runs inside the worker processes."""
+    import matplotlib.pyplot as plt
+
+    fig = plot(data, **params)
+    fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+    plt.close(fig)
+    return path
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _update_manifest(path, updates):
+    """
+    Writing this build's entries into the manifest (None removes one).
+
+    The read-modify-write holds an exclusive lock on a sidecar lock file, so
+    builds running concurrently into the same directory (eda and train in
+    the pipeline) keep each other's entries, and the manifest is replaced
+    atomically for readers that don't lock.
+    """
+    if not updates:
+        return
+    with open(f'{path}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = _load_manifest(path)
+        for filename, key in updates.items():
+            if key is None:
+                manifest.pop(filename, None)
+            else:
+                manifest[filename] = key
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+        os.replace(tmp, path)
+
+
+@instrument
+def build_figures(specs, figures_dir, n_jobs=None, force=False):
+    """
+    Rendering the figures whose inputs changed and reusing the others.
+
+    A figure is reused when its file exists and the hash of its input columns,
+    parameters and plot code matches the manifest. The rest are rendered in
+    up to n_jobs worker processes (all cores by default). A single figure is
+    drawn in-process when the current backend is non-interactive; the
+    caller's backend is never switched. Returns a summary with the 'rendered' and 'reused' file
+    names and the wall time.
+    """
+    start = time.perf_counter()
+    os.makedirs(figures_dir, exist_ok=True)
+    manifest_path = os.path.join(figures_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    column_digest = _column_hasher()
+    pending, reused = [], []
+    for spec in specs:
+        key = spec.key(column_digest)
+        path = os.path.join(figures_dir, spec.filename)
+        if not force and manifest.get(spec.filename) == key and os.path.exists(path):
+            reused.append(spec.filename)
+        else:
+            pending.append((spec, key, path))
+
+    jobs = [(spec.plot, spec.data[spec.columns], spec.params, path, spec.dpi, spec.bbox_inches)
+            for spec, _, path in pending]
+    workers = min(n_jobs or os.cpu_count() or 1, len(jobs))
+
+    rendered, errors = [], []
+    if workers == 0:
+        outcomes = []
+    elif workers == 1 and _renders_in_process():
+        outcomes = []
+        for job in jobs:
+            try:
+                outcomes.append(_render(*job))
+            except Exception as e:
+                outcomes.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+            futures = [pool.submit(_render, *job) for job in jobs]
+            outcomes = [f.exception() or f.result() for f in futures]
+
+    updates = {}
+    for (spec, key, _), outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            updates[spec.filename] = None
+            errors.append((spec.filename, outcome))
+        else:
+            updates[spec.filename] = key
+            rendered.append(spec.filename)
+
+    _update_manifest(manifest_path, updates)
+
+    if errors:
+        filename, error = errors[0]
+        raise RuntimeError(f"Failed to render {len(errors)} figure(s), first {filename}: {error}") from error
+
+    return {
+        'rendered': rendered,
+        'reused': reused,
+        'workers': workers,
+        'wall_time': time.perf_counter() - start
+    }
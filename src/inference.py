@@ -0,0 +1,65 @@
+"""
+Inference-only entry point for scoring raw records with a saved model.
+
+Imports NumPy, pandas and the fitted preprocessor only. Unpickling a
+scikit-learn model loads that estimator's own modules, but never matplotlib,
+seaborn or the training code in src.models; a FlatForest saved as .npz
+needs no scikit-learn at all.
+
+Usage:
+    from src.inference import Predictor
+
+    predictor = Predictor("reports/models/random_forest.pkl")
+    predictor.predict({"longitude": -122.23, ..., "ocean_proximity": "NEAR BAY"})
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .preprocessor import HousingPreprocessor
+
+PREPROCESSOR_FILE = 'preprocessor.json'
+
+
+def load_model(path):
+    """Loading a pickled model (.pkl) or a flattened forest (.npz)."""
+    if path.endswith('.npz'):
+        from .tree_engine import FlatForest
+        return FlatForest.load(path)
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Model file not found at: {path}")
+
+
+class Predictor:
+    """
+    A saved model and its fitted preprocessor, predicting raw records.
+
+    Parameters:
+    - model_path (str): .pkl model or .npz FlatForest
+    - preprocessor_path (str): preprocessor.json, by default next to the model
+    """
+
+    def __init__(self, model_path, preprocessor_path=None):
+        if preprocessor_path is None:
+            preprocessor_path = os.path.join(os.path.dirname(model_path), PREPROCESSOR_FILE)
+        self.model = load_model(model_path)
+        self.preprocessor = HousingPreprocessor.load(preprocessor_path)
+
+    def predict(self, records):
+        """
+        Predicting a DataFrame, a list of dicts or a single dict of raw feature values.
+
+        A target column in the records is ignored.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, pd.DataFrame):
+            records = pd.DataFrame(records)
+        features = self.preprocessor.transform(records)[self.preprocessor.feature_names]
+        return np.asarray(self.model.predict(features))
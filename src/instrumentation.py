@@ -0,0 +1,230 @@
+"""
+Opt-in timing and memory instrumentation for the pipeline functions.
+
+Functions decorated with @instrument record wall time, CPU time, peak
+allocated memory and rows in/out for every call while instrumentation is
+enabled, and pass each record to the active sinks. When disabled the wrapper
+only checks one flag before calling the function.
+
+Usage:
+    from src.instrumentation import enable, disable, JsonReportSink, LoggingSink
+
+    enable(JsonReportSink("reports/results/instrumentation.json"), LoggingSink())
+    preprocess_data("data/raw/housing.csv")
+    disable()   # writes the report
+
+The pipeline scripts turn it on with the HOUSING_INSTRUMENT environment
+variable (see enable_from_env).
+"""
+
+import atexit
+import cProfile
+import functools
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+_enabled = False
+_track_memory = False
+_started_tracemalloc = False
+_sinks = []
+_stack = []
+
+
+def instrument(func):
+    """Decorating a pipeline function so its calls are recorded while enabled."""
+    stage = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        return _record_call(stage, func, args, kwargs)
+
+    return wrapper
+
+
+def _count_rows(obj):
+    """Returning the number of rows of a frame, array, results dict or split, if any."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(obj)
+    if isinstance(obj, tuple) and obj:
+        return _count_rows(obj[0])
+    if isinstance(obj, dict) and 'predictions' in obj:
+        return len(obj['predictions'])
+    return None
+
+
+def _record_call(stage, func, args, kwargs):
+    frame = {'peak': 0}
+    if _track_memory:
+        start_memory, peak = tracemalloc.get_traced_memory()
+        # tracemalloc keeps one global peak: save the parent's so far before resetting it
+        if _stack:
+            _stack[-1]['peak'] = max(_stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+    _stack.append(frame)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        _stack.pop()
+
+    record = {
+        'stage': stage,
+        'depth': len(_stack),
+        'wall_s': wall,
+        'cpu_s': cpu,
+        'peak_mb': None,
+        'rows_in': _count_rows(args[0]) if args else None,
+        'rows_out': _count_rows(result)
+    }
+
+    if _track_memory:
+        # Nested stages reset the peak, so each frame also keeps the largest one it saw
+        peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+        record['peak_mb'] = (peak - start_memory) / 1e6
+        if _stack:
+            _stack[-1]['peak'] = max(_stack[-1]['peak'], peak)
+
+    for sink in _sinks:
+        sink.emit(record)
+    return result
+
+
+class JsonReportSink:
+    """Collecting records and writing them with per-stage totals to a JSON file on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = []
+
+    def start(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def summary(self):
+        """Totals per stage: calls, wall and CPU time, largest peak memory."""
+        totals = {}
+        for r in self.records:
+            t = totals.setdefault(r['stage'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mb': None})
+            t['calls'] += 1
+            t['wall_s'] += r['wall_s']
+            t['cpu_s'] += r['cpu_s']
+            if r['peak_mb'] is not None:
+                t['peak_mb'] = max(t['peak_mb'] or 0.0, r['peak_mb'])
+        return totals
+
+    def close(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'summary': self.summary(), 'records': self.records}, f, indent=4)
+
+
+class LoggingSink:
+    """Logging every record as one JSON line."""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('housing.instrumentation')
+        self.level = level
+
+    def start(self):
+        if not logging.getLogger().handlers and not self.logger.handlers:
+            logging.basicConfig(level=self.level, format='%(asctime)s %(name)s %(message)s')
+
+    def emit(self, record):
+        self.logger.log(self.level, json.dumps(record))
+
+    def close(self):
+        pass
+
+
+class CProfileSink:
+    """Profiling everything while enabled and dumping pstats data to a file on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def emit(self, record):
+        pass
+
+    def close(self):
+        self.profiler.disable()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.profiler.dump_stats(self.path)
+
+
+def enable(*sinks, track_memory=True):
+    """Turning instrumentation on with the given sinks."""
+    global _enabled, _track_memory, _started_tracemalloc
+    if _enabled:
+        disable()
+    _sinks[:] = sinks
+    _track_memory = track_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    for sink in _sinks:
+        sink.start()
+    _enabled = True
+
+
+def disable():
+    """
+    Turning instrumentation off and closing the sinks (this writes their output).
+
+    tracemalloc is stopped only if enable() started it.
+    """
+    global _enabled, _started_tracemalloc
+    if not _enabled:
+        return
+    _enabled = False
+    for sink in _sinks:
+        sink.close()
+    _sinks.clear()
+    if _started_tracemalloc and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _started_tracemalloc = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable_from_env(name, results_dir):
+    """
+    Enabling instrumentation when HOUSING_INSTRUMENT is set, for the pipeline scripts.
+
+    Writes <results_dir>/instrumentation_<name>.json and logs every stage.
+    If the variable contains 'profile', a cProfile dump is also written to
+    <results_dir>/profile_<name>.prof. Returns whether it was enabled.
+    """
+    value = os.environ.get('HOUSING_INSTRUMENT', '')
+    if value.lower() in ('', '0', 'false'):
+        return False
+
+    sinks = [JsonReportSink(os.path.join(results_dir, f'instrumentation_{name}.json')), LoggingSink()]
+    if 'profile' in value.lower():
+        sinks.append(CProfileSink(os.path.join(results_dir, f'profile_{name}.prof')))
+    enable(*sinks)
+    atexit.register(disable)
+    return True
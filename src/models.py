@@ -2,14 +2,24 @@
 Machine learning functions for housing price prediction.
 """
 
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from threadpoolctl import threadpool_limits
+
+from .evaluation import evaluate_predictions
+from .feature_matrix import FeatureMatrix
+from .instrumentation import instrument
 
+@instrument
 def prepare_data(df, target_col='median_house_value', test_size=0.2):
     """
     Splitting features and target into train and test sets.
@@ -26,10 +36,31 @@ def prepare_data(df, target_col='median_house_value', test_size=0.2):
 
     return X_train, X_test, y_train, y_test
 
-def train_linear_regression(X_train, y_train, X_test, y_test):
+@instrument
+def prepare_matrix(df, target_col='median_house_value', test_size=0.2, dtype=np.float64):
+    """
+    Splitting like prepare_data into one contiguous FeatureMatrix instead of four frames.
+
+    The rows of each split are the same as prepare_data's. Features are
+    copied once into a dtype matrix (training rows first) and the splits are
+    views of it; matrix.frames() returns them as DataFrames without copying.
+    """
+    if target_col not in df.columns:
+        raise ValueError(f"Target column '{target_col}' not found in DataFrame")
+
+    train_rows, test_rows = train_test_split(
+        np.arange(len(df)), test_size=test_size, random_state=42
+    )
+
+    return FeatureMatrix.from_frame(df, target_col, train_rows, test_rows, dtype=dtype)
+
+@instrument
+def train_linear_regression(X_train, y_train, X_test, y_test, n_bootstrap=0):
     """
     Training and evaluating a Linear Regression model.
-    Returns trained model and evaluation metrics.
+    Returns trained model and evaluation metrics. Like every train_* function,
+    n_bootstrap > 0 adds bootstrap confidence intervals under 'ci' from the
+    same evaluation pass.
     """
 
     model = LinearRegression()
@@ -39,49 +70,300 @@ def train_linear_regression(X_train, y_train, X_test, y_test):
 
     results = {
         'model': model,
-        'r2': r2_score(y_test, y_pred),
-        'mse': mean_squared_error(y_test, y_pred),
-        'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
-        'mae': mean_absolute_error(y_test, y_pred),
+        **evaluate_predictions(y_test, y_pred, n_bootstrap=n_bootstrap),
         'predictions': y_pred
     }
 
     return results
 
-def train_decision_tree(X_train, y_train, X_test, y_test):
-    """Training and evaluating Decision Tree."""
-    model = DecisionTreeRegressor(max_depth=10, random_state=42)
+@instrument
+def train_decision_tree(X_train, y_train, X_test, y_test, max_depth=10, random_state=42,
+                        n_bootstrap=0, **params):
+    """Training and evaluating Decision Tree. Extra params go to DecisionTreeRegressor."""
+    model = DecisionTreeRegressor(max_depth=max_depth, random_state=random_state, **params)
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_test)
 
     results = {
         'model': model,
-        'r2': r2_score(y_test, y_pred),
-        'mse': mean_squared_error(y_test, y_pred),
-        'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
-        'mae': mean_absolute_error(y_test, y_pred),
+        **evaluate_predictions(y_test, y_pred, n_bootstrap=n_bootstrap),
         'predictions': y_pred,
         'feature_importances': dict(zip(X_train.columns, model.feature_importances_))
     }
 
     return results
 
-def train_random_forest(X_train, y_train, X_test, y_test):
-    """Training and evaluating Random Forest (bonus)."""
-    model = RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42)
+@instrument
+def train_random_forest(X_train, y_train, X_test, y_test, n_jobs=None, n_estimators=100,
+                        max_depth=15, random_state=42, n_bootstrap=0, **params):
+    """
+    Training and evaluating Random Forest (bonus).
+    n_jobs sets the cores used for the trees; extra params go to RandomForestRegressor.
+    """
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth,
+                                  random_state=random_state, n_jobs=n_jobs, **params)
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_test)
 
     results = {
         'model': model,
-        'r2': r2_score(y_test, y_pred),
-        'mse': mean_squared_error(y_test, y_pred),
-        'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
-        'mae': mean_absolute_error(y_test, y_pred),
+        **evaluate_predictions(y_test, y_pred, n_bootstrap=n_bootstrap),
         'predictions': y_pred,
         'feature_importances': dict(zip(X_train.columns, model.feature_importances_))
     }
 
-    return results
\ No newline at end of file
+    return results
+
+@instrument
+def train_hist_gradient_boosting(X_train, y_train, X_test, y_test, n_jobs=None, max_iter=500,
+                                 learning_rate=0.1, max_leaf_nodes=31, max_bins=255,
+                                 early_stopping=True, validation_fraction=0.1, n_iter_no_change=20,
+                                 random_state=42, n_bootstrap=0, **params):
+    """
+    Training and evaluating histogram-based gradient boosting.
+
+    Features are binned once into at most max_bins quantile bins. Each split
+    is then found from per-bin gradient histograms, scanning max_bins
+    candidates instead of sorting every distinct float value. With early_stopping,
+    validation_fraction of the training rows is held out and boosting stops
+    once the validation loss has not improved for n_iter_no_change
+    iterations. n_jobs caps the OpenMP threads: None leaves them unlimited and
+    negative values count back from the number of cores, as in scikit-learn
+    (-1 uses all of them). Extra params go to HistGradientBoostingRegressor.
+    """
+    model = HistGradientBoostingRegressor(
+        max_iter=max_iter, learning_rate=learning_rate, max_leaf_nodes=max_leaf_nodes,
+        max_bins=max_bins, early_stopping=early_stopping,
+        validation_fraction=validation_fraction if early_stopping else None,
+        n_iter_no_change=n_iter_no_change, random_state=random_state, **params
+    )
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    with threadpool_limits(limits=n_jobs, user_api='openmp'):
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+
+    results = {
+        'model': model,
+        **evaluate_predictions(y_test, y_pred, n_bootstrap=n_bootstrap),
+        'predictions': y_pred,
+        'n_iter': int(model.n_iter_)
+    }
+
+    return results
+
+
+class IncrementalLinearRegression:
+    """
+    Linear regression updated from sufficient statistics instead of refitting.
+
+    Keeps the row count, the feature and target means and the centered
+    cross-products X^T X and X^T y, merged chunk by chunk with the pairwise
+    update of Chan et al., so memory is O(features^2) regardless of how many
+    rows are absorbed. Statistics from separate partitions can be merged.
+    Coefficients are solved on demand and match LinearRegression fitted on all rows.
+    """
+
+    def __init__(self):
+        self.n_samples_ = 0
+        self.mean_x_ = None
+        self.mean_y_ = 0.0
+        self.sxx_ = None
+        self.sxy_ = None
+        self.feature_names_in_ = None
+        self.coef_ = None
+        self.intercept_ = None
+
+    def partial_fit(self, X, y):
+        """Absorbing a chunk of rows."""
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names_in_ is None:
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            X = X[self.feature_names_in_]
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(X) == 0:
+            return self
+
+        chunk = IncrementalLinearRegression()
+        chunk.n_samples_ = len(X)
+        chunk.mean_x_ = X.mean(axis=0)
+        chunk.mean_y_ = y.mean()
+        Xc = X - chunk.mean_x_
+        chunk.sxx_ = Xc.T @ Xc
+        chunk.sxy_ = Xc.T @ (y - chunk.mean_y_)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Merging the statistics of another model fitted on different rows, in place."""
+        if other.n_samples_ == 0:
+            return self
+        if self.n_samples_ == 0:
+            self.n_samples_ = other.n_samples_
+            self.mean_x_, self.mean_y_ = other.mean_x_.copy(), other.mean_y_
+            self.sxx_, self.sxy_ = other.sxx_.copy(), other.sxy_.copy()
+            if self.feature_names_in_ is None:
+                self.feature_names_in_ = other.feature_names_in_
+            self.coef_ = None
+            return self
+
+        n_a, n_b = self.n_samples_, other.n_samples_
+        n = n_a + n_b
+        delta_x = other.mean_x_ - self.mean_x_
+        delta_y = other.mean_y_ - self.mean_y_
+
+        self.sxx_ = self.sxx_ + other.sxx_ + np.outer(delta_x, delta_x) * (n_a * n_b / n)
+        self.sxy_ = self.sxy_ + other.sxy_ + delta_x * delta_y * (n_a * n_b / n)
+        self.mean_x_ = self.mean_x_ + delta_x * (n_b / n)
+        self.mean_y_ = self.mean_y_ + delta_y * (n_b / n)
+        self.n_samples_ = n
+        self.coef_ = None
+        return self
+
+    def fit(self, X, y, chunk_size=100_000):
+        """Fitting from scratch, absorbing X in chunks."""
+        self.__init__()
+        for start in range(0, len(X), chunk_size):
+            self.partial_fit(X[start:start + chunk_size], y[start:start + chunk_size])
+        return self.solve()
+
+    def solve(self):
+        """Solving the normal equations for the current statistics."""
+        if self.n_samples_ == 0:
+            raise ValueError("IncrementalLinearRegression has no data yet, call partial_fit() first")
+        # Scale to unit diagonal first: raw features range from ~1 to ~1e4
+        scale = np.sqrt(np.diag(self.sxx_))
+        scale[scale == 0] = 1.0
+        coef, *_ = np.linalg.lstsq(self.sxx_ / np.outer(scale, scale), self.sxy_ / scale, rcond=None)
+        self.coef_ = coef / scale
+        self.intercept_ = self.mean_y_ - self.mean_x_ @ self.coef_
+        return self
+
+    def predict(self, X):
+        if self.coef_ is None:
+            self.solve()
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            X = X[self.feature_names_in_]
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+@instrument
+def train_incremental_linear_regression(X_train, y_train, X_test, y_test, chunk_size=100_000,
+                                        n_bootstrap=0):
+    """Training and evaluating the incremental Linear Regression, chunk by chunk."""
+    model = IncrementalLinearRegression().fit(X_train, y_train, chunk_size=chunk_size)
+
+    y_pred = model.predict(X_test)
+
+    results = {
+        'model': model,
+        **evaluate_predictions(y_test, y_pred, n_bootstrap=n_bootstrap),
+        'predictions': y_pred
+    }
+
+    return results
+
+
+def _timed_train(trainer, X_train, y_train, X_test, y_test, kwargs):
+    """Running one trainer and adding its wall time to the results."""
+    start = time.perf_counter()
+    if isinstance(X_train, FeatureMatrix):
+        X_train, X_test, y_train, y_test = X_train.frames()
+    results = trainer(X_train, y_train, X_test, y_test, **kwargs)
+    results['train_time'] = time.perf_counter() - start
+    return results
+
+
+def _trainer_kwargs(trainer, n_jobs, n_bootstrap):
+    """The n_jobs and n_bootstrap arguments a trainer accepts."""
+    accepts = inspect.signature(trainer).parameters
+    kwargs = {'n_jobs': n_jobs} if 'n_jobs' in accepts else {}
+    if n_bootstrap and 'n_bootstrap' in accepts:
+        kwargs['n_bootstrap'] = n_bootstrap
+    return kwargs
+
+
+@instrument
+def train_models_serial(trainers, X_train, y_train=None, X_test=None, y_test=None, n_jobs=None,
+                        n_bootstrap=0):
+    """
+    Training the models one after another in this process, the baseline for train_models_parallel.
+
+    The trainers that accept n_jobs get the whole core budget (all cores when
+    None). Takes the same arguments as train_models_parallel and returns the
+    results dicts by name, each with an added 'train_time', and the wall time.
+    """
+    cores = n_jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = {name: _timed_train(trainer, X_train, y_train, X_test, y_test,
+                                  _trainer_kwargs(trainer, cores, n_bootstrap))
+               for name, trainer in trainers.items()}
+    return results, time.perf_counter() - start
+
+
+@instrument
+def train_models_parallel(trainers, X_train, y_train=None, X_test=None, y_test=None, n_jobs=None,
+                          n_bootstrap=0, serial_time=None):
+    """
+    Training independent models concurrently in a process pool.
+
+    Each trainer runs in its own process. The cores left over after giving
+    every trainer one process are split between the trainers that accept an
+    n_jobs argument (the ensembles), so the forest's trees use them too.
+
+    Parameters:
+    - trainers (dict): Model name -> train_* function
+    - X_train: Training features, or a FeatureMatrix from prepare_matrix holding
+      all four splits. A FeatureMatrix is placed in shared memory for the
+      duration of the call, so workers attach to it instead of receiving copies.
+    - n_jobs (int): Total core budget, all cores when None
+    - n_bootstrap (int): Passed to the trainers that accept it, for confidence intervals
+    - serial_time (float): Wall time of train_models_serial on the same trainers
+      and data, to compute the speedup against
+
+    Returns the results dicts by name, each with an added 'train_time', and a
+    timing summary with the overall wall time, the speedup over serial_time
+    (None without it) and the overlap ratio, the sum of the per-model times
+    divided by the wall time. The ratio measures how much the trainers
+    overlapped, not a speedup: the ensembles already use several cores
+    inside their workers.
+    """
+    cores = n_jobs or os.cpu_count() or 1
+    workers = max(1, min(len(trainers), cores))
+    parallel = [name for name, trainer in trainers.items()
+                if 'n_jobs' in inspect.signature(trainer).parameters]
+    ensemble_cores = max(1, (cores - workers + len(parallel)) // max(1, len(parallel)))
+
+    matrix = X_train if isinstance(X_train, FeatureMatrix) else None
+    shared_here = matrix is not None and not matrix.shared
+
+    start = time.perf_counter()
+    try:
+        if shared_here:
+            matrix.share()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(_timed_train, trainer, X_train, y_train, X_test, y_test,
+                                      _trainer_kwargs(trainer, ensemble_cores, n_bootstrap))
+                for name, trainer in trainers.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    finally:
+        if shared_here:
+            matrix.close()
+    wall_time = time.perf_counter() - start
+
+    model_time = sum(res['train_time'] for res in results.values())
+    summary = {
+        'wall_time': wall_time,
+        'sum_model_time': model_time,
+        'speedup': serial_time / wall_time if serial_time else None,
+        'serial_time': serial_time,
+        'overlap_ratio': model_time / wall_time,
+        'workers': workers,
+        'cores': cores,
+        'ensemble_cores': ensemble_cores
+    }
+    return results, summary
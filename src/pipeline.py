@@ -0,0 +1,281 @@
+"""
+Incremental runner for the numbered pipeline scripts.
+
+The stages (explore, preprocess, EDA, train, predict) are declared with the
+files they read and write; a stage depends on the stages producing its
+inputs. A stage is skipped when the contents of its inputs, its script and
+the src/ package, and its parameters hash to the same key as its last
+successful run and its outputs are unchanged. Stages whose dependencies are
+done run concurrently. Every run appends the time of each stage to
+reports/results/pipeline_runs.json.
+
+Run from the project root:
+    python -m src.pipeline                  # run what changed
+    python -m src.pipeline --force train    # re-run train even if nothing changed
+    python -m src.pipeline --dry-run        # show what would run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+
+from .cache import file_digest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_PATH = 'data/cache/pipeline_state.json'
+RUNS_PATH = 'reports/results/pipeline_runs.json'
+LOGS_DIR = 'reports/results/pipeline_logs'
+
+# Bump when the way stages are keyed changes
+PIPELINE_VERSION = 1
+
+
+class Stage:
+    """
+    One pipeline script and the files it reads and writes.
+
+    Parameters:
+    - name (str): Stage name
+    - script (str): Script path relative to the project root, run from its directory
+    - inputs (list): Files or directories the stage reads
+    - outputs (list): Files or directories the stage writes
+    - params (dict): Extra environment variables for the script, part of the stage key
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), params=None):
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+
+
+STAGES = [
+    Stage('explore', 'notebooks/01_data_exploration.py',
+          inputs=['data/raw/housing.csv']),
+    Stage('preprocess', 'notebooks/02_data_preprocessing.py',
+          inputs=['data/raw/housing.csv'],
+          outputs=['data/processed/housing_cleaned.csv', 'reports/models/preprocessor.json']),
+    Stage('eda', 'notebooks/03_eda_visualization.py',
+          inputs=['data/processed/housing_cleaned.csv'],
+          outputs=[f'reports/figures/{name}.png' for name in [
+              '01_price_distribution', '02_income_distribution', '03_income_vs_price',
+              '04_correlation_heatmap', '05_rooms_vs_price', '06_geographic_distribution']]),
+    Stage('train', 'notebooks/04_machine_learning.py',
+          inputs=['data/processed/housing_cleaned.csv'],
+          outputs=['reports/results/model_results.json',
+                   'reports/results/training_summary.json',
+                   'reports/models/linear_regression.pkl',
+                   'reports/models/decision_tree.pkl',
+                   'reports/models/random_forest.pkl',
+                   'reports/models/gradient_boosting.pkl',
+                   'reports/figures/07_model_comparison.png',
+                   'reports/figures/08_linear_regression_prediction.png',
+                   'reports/figures/09_decision_tree_prediction.png',
+                   'reports/figures/010_random_forest_prediction.png',
+                   'reports/figures/011_gradient_boosting_prediction.png']),
+    Stage('predict', 'notebooks/05_predict_example.py',
+          inputs=['reports/models/random_forest.pkl', 'reports/models/preprocessor.json'],
+          outputs=['reports/results/prediction_example.json'])
+]
+
+
+def path_digest(path):
+    """Hashing a file, or every file under a directory; None when it does not exist."""
+    full = os.path.join(ROOT, path)
+    if os.path.isfile(full):
+        return file_digest(full)
+    if not os.path.isdir(full):
+        return None
+    digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(full):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            file_path = os.path.join(directory, name)
+            digest.update(os.path.relpath(file_path, full).encode())
+            digest.update(file_digest(file_path).encode())
+    return digest.hexdigest()
+
+
+def dependencies(stages):
+    """Mapping each stage name to the names of the stages producing its inputs."""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {stage.name: sorted({producers[i] for i in stage.inputs
+                                if i in producers and producers[i] != stage.name})
+            for stage in stages}
+
+
+def stage_key(stage):
+    """Hashing a stage's script, the src/ package, its inputs and parameters."""
+    payload = json.dumps({
+        'version': PIPELINE_VERSION,
+        'script': path_digest(stage.script),
+        'src': path_digest('src'),
+        'inputs': {path: path_digest(path) for path in stage.inputs},
+        'params': stage.params
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def is_current(stage, key, state):
+    """True when the last successful run had the same key and left the outputs unchanged."""
+    previous = state.get(stage.name)
+    if previous is None or previous['key'] != key:
+        return False
+    return all(path_digest(path) == previous['outputs'].get(path) for path in stage.outputs)
+
+
+def run_stage(stage):
+    """Running a stage's script from its own directory and logging its output."""
+    script = os.path.join(ROOT, stage.script)
+    log_path = os.path.join(ROOT, LOGS_DIR, f'{stage.name}.log')
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    env = {**os.environ, **{k: str(v) for k, v in stage.params.items()}}
+
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        process = subprocess.run([sys.executable, os.path.basename(script)],
+                                 cwd=os.path.dirname(script), env=env,
+                                 stdout=log, stderr=subprocess.STDOUT)
+    elapsed = time.perf_counter() - start
+
+    missing = [path for path in stage.outputs if path_digest(path) is None]
+    if process.returncode != 0:
+        error = f"exit status {process.returncode}"
+    elif missing:
+        error = f"outputs not written: {', '.join(missing)}"
+    else:
+        error = None
+    return elapsed, error
+
+
+def _load_json(path, default):
+    try:
+        with open(os.path.join(ROOT, path)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def _save_json(path, data):
+    full = os.path.join(ROOT, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def run_pipeline(stages=STAGES, force=(), max_workers=None, dry_run=False, log=print):
+    """
+    Running the stages whose key changed, independent ones concurrently.
+
+    A stage is scheduled once all stages producing its inputs have finished,
+    so its key reflects their fresh outputs: a stage whose upstream re-ran
+    but wrote identical files is still skipped. Stages named in force run
+    regardless of their key; stages downstream of a failure are not run.
+    Returns the run record that is appended to pipeline_runs.json.
+    """
+    deps = dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(force) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    state = _load_json(STATE_PATH, {})
+    records = {}
+    started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    start = time.perf_counter()
+
+    def settle(name, status, seconds=0.0, error=None):
+        records[name] = {'stage': name, 'status': status, 'seconds': seconds}
+        if error:
+            records[name]['error'] = error
+        log(f"   {name:<12} {status:<8} {seconds:8.2f}s" + (f"  ({error})" if error else ""))
+
+    pending = {stage.name for stage in stages}
+    running = {}
+    keys = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages)) as pool:
+        while pending or running:
+            ready = [name for name in sorted(pending)
+                     if not any(d in pending or d in running.values() for d in deps[name])]
+            if not ready and not running:
+                raise ValueError(f"Stages depend on each other: {', '.join(sorted(pending))}")
+
+            for name in ready:
+                pending.discard(name)
+                stage = by_name[name]
+                upstream = [records[d]['status'] for d in deps[name]]
+                if 'failed' in upstream or 'blocked' in upstream:
+                    settle(name, 'blocked')
+                    continue
+                keys[name] = stage_key(stage)
+                if name not in force and 'would run' not in upstream and is_current(stage, keys[name], state):
+                    settle(name, 'skipped')
+                elif dry_run:
+                    settle(name, 'would run')
+                else:
+                    log(f"   {name:<12} started")
+                    running[pool.submit(run_stage, stage)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                seconds, error = future.result()
+                if error:
+                    state.pop(name, None)
+                    settle(name, 'failed', seconds, error)
+                else:
+                    stage = by_name[name]
+                    state[name] = {'key': keys[name],
+                                   'outputs': {p: path_digest(p) for p in stage.outputs}}
+                    settle(name, 'ran', seconds)
+
+    run = {
+        'started': started,
+        'wall_s': time.perf_counter() - start,
+        'stages': [records[stage.name] for stage in stages]
+    }
+    if not dry_run:
+        _save_json(STATE_PATH, state)
+        runs = _load_json(RUNS_PATH, [])
+        runs.append(run)
+        _save_json(RUNS_PATH, runs)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipeline stages whose inputs changed.")
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help="Re-run these stages (all stages when none are named)")
+    parser.add_argument('--jobs', type=int, default=None, help="Maximum concurrent stages")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would run")
+    args = parser.parse_args()
+
+    names = [stage.name for stage in STAGES]
+    force = names if args.force == [] else (args.force or [])
+
+    print("\n" + "★" * 40)
+    print("Pipeline")
+    print("★" * 40)
+    run = run_pipeline(force=force, max_workers=args.jobs, dry_run=args.dry_run)
+
+    counts = {}
+    for record in run['stages']:
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+    print(f"\n{', '.join(f'{n} {s}' for s, n in counts.items())} in {run['wall_s']:.2f}s")
+    if not args.dry_run:
+        print(f"Stage times appended to {RUNS_PATH}, logs in {LOGS_DIR}/")
+    if counts.get('failed'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
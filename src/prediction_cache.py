@@ -0,0 +1,233 @@
+"""
+LRU prediction cache in front of a saved model.
+
+Raw records are canonicalized into a fixed-order tuple of the input columns,
+with numeric values optionally rounded, and keyed together with the SHA-256
+of the model and preprocessor files. A batch is looked up in one pass; only
+the distinct missing rows go through the preprocessor and the model, in a
+single call. Entries are evicted least-recently-used beyond max_size and
+expire after ttl seconds. When the model or preprocessor file changes on
+disk, the predictor is reloaded and every entry is dropped.
+
+Usage:
+    from src.prediction_cache import CachedPredictor
+
+    predictor = CachedPredictor("reports/models/random_forest.pkl", decimals=4)
+    predictor.predict(records)
+    predictor.stats()       # hits, misses, evictions, expired, size, hit_rate
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_digest
+from .inference import Predictor, PREPROCESSOR_FILE
+from .preprocessor import RAW_FEATURES
+
+KEY_COLUMNS = RAW_FEATURES + ['ocean_proximity']
+
+
+class LRUCache:
+    """
+    Mapping keys to values with least-recently-used eviction and an optional TTL.
+
+    Parameters:
+    - max_size (int): Maximum number of entries
+    - ttl (float): Seconds an entry stays valid, None for no expiry
+    - clock (callable): Time source in seconds
+    """
+
+    def __init__(self, max_size=100_000, ttl=None, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_many(self, keys):
+        """Returning the cached value of each key, None for misses and expired entries."""
+        now = self.clock()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expired += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    values.append(entry[0])
+        return values
+
+    def put_many(self, keys, values):
+        """Storing values, evicting the least recently used entries beyond max_size."""
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (value, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returning the counters as a JSON-serializable dict."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+def canonical_keys(records, decimals=None):
+    """
+    Reducing raw records to hashable tuples of the values that determine a prediction.
+
+    Each tuple holds the KEY_COLUMNS in order: numbers as floats, rounded when
+    decimals is an int or a {column: int} dict, and missing values as None.
+    A single dict or a list of dicts is keyed without building a DataFrame,
+    with the same columns pd.DataFrame(records) would have: a field missing
+    from some of the records is a missing value in those.
+    """
+    if isinstance(records, dict):
+        records = [records]
+    if isinstance(records, pd.DataFrame):
+        present = set(records.columns)
+        column = lambda col: records[col].to_numpy()
+    else:
+        # Like pd.DataFrame(records): a key set in any record is a column, absent elsewhere
+        present = set().union(*records) if records else set(KEY_COLUMNS)
+        column = lambda col: [record.get(col) for record in records]
+    missing = [col for col in RAW_FEATURES if col not in present]
+    if missing:
+        raise ValueError(f"Missing input columns: {missing}")
+
+    columns = []
+    for col in RAW_FEATURES:
+        values = np.asarray(column(col), dtype=np.float64)
+        places = decimals.get(col) if isinstance(decimals, dict) else decimals
+        if places is not None:
+            values = np.round(values, places)
+        columns.append(np.where(np.isnan(values), None, values.astype(object)).tolist())
+    if 'ocean_proximity' in present:
+        columns.append([None if pd.isna(v) else str(v) for v in column('ocean_proximity')])
+    else:
+        columns.append([None] * len(columns[0]))
+    return list(zip(*columns))
+
+
+def _frame(keys):
+    """Rebuilding raw records from canonical keys."""
+    df = pd.DataFrame(keys, columns=KEY_COLUMNS)
+    df[RAW_FEATURES] = df[RAW_FEATURES].astype(np.float64)
+    return df
+
+
+class CachedPredictor:
+    """
+    A Predictor whose predictions are cached per canonical record.
+
+    Parameters:
+    - model_path (str): .pkl model or .npz FlatForest
+    - preprocessor_path (str): preprocessor.json, by default next to the model
+    - max_size (int): Maximum cached records
+    - ttl (float): Seconds a cached prediction stays valid, None for no expiry
+    - decimals (int or dict): Rounding of numeric inputs before keying, None for exact values
+    - check_interval (float): Minimum seconds between checks for changed model files
+    """
+
+    def __init__(self, model_path, preprocessor_path=None, max_size=100_000, ttl=None,
+                 decimals=None, check_interval=1.0):
+        if preprocessor_path is None:
+            preprocessor_path = os.path.join(os.path.dirname(model_path), PREPROCESSOR_FILE)
+        self.model_path = model_path
+        self.preprocessor_path = preprocessor_path
+        self.decimals = decimals
+        self.check_interval = check_interval
+        self.cache = LRUCache(max_size, ttl)
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _file_state(self):
+        return tuple((s.st_mtime_ns, s.st_size) for s in
+                     (os.stat(self.model_path), os.stat(self.preprocessor_path)))
+
+    def _load(self):
+        self._state = self._file_state()
+        self.model_digest = file_digest(self.model_path)[:16] + file_digest(self.preprocessor_path)[:16]
+        self.predictor = Predictor(self.model_path, self.preprocessor_path)
+        self._checked = time.monotonic()
+
+    def refresh(self):
+        """Reloading the model and dropping every entry if its files changed. Returns True on reload."""
+        with self._lock:
+            self._checked = time.monotonic()
+            if self._file_state() == self._state:
+                return False
+            digest = self.model_digest
+            self._load()
+            if self.model_digest == digest:
+                return False
+            self.invalidate()
+            return True
+
+    def invalidate(self):
+        """Dropping every cached prediction."""
+        self.cache.clear()
+        self.invalidations += 1
+
+    def predict(self, records):
+        """
+        Predicting a DataFrame, a list of dicts or a single dict of raw feature values.
+
+        Cached rows are answered from the cache; the distinct remaining rows
+        are predicted in one batch, from their canonical (rounded) values.
+        """
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+
+        digest = self.model_digest
+        keys = [(digest, row) for row in canonical_keys(records, self.decimals)]
+        values = self.cache.get_many(keys)
+
+        missing = list(dict.fromkeys(key for key, value in zip(keys, values) if value is None))
+        if missing:
+            predictions = self.predictor.predict(_frame([row for _, row in missing])).tolist()
+            self.cache.put_many(missing, predictions)
+            computed = dict(zip(missing, predictions))
+            values = [computed[key] if value is None else value for key, value in zip(keys, values)]
+
+        return np.asarray(values, dtype=np.float64)
+
+    def stats(self):
+        """Cache counters plus the number of invalidations."""
+        return {**self.cache.stats(), 'invalidations': self.invalidations}
@@ -0,0 +1,178 @@
+"""
+Fitted preprocessing transformer for reusing training statistics at inference time.
+"""
+
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .data_processing import (
+    create_features,
+    compute_outlier_bounds,
+    outlier_mask,
+    _encode_ocean_proximity
+)
+
+RAW_FEATURES = [
+    'longitude', 'latitude', 'housing_median_age', 'total_rooms',
+    'total_bedrooms', 'population', 'households', 'median_income'
+]
+
+
+class HousingPreprocessor:
+    """
+    Learning the preprocess_data statistics once and applying them to new rows.
+
+    fit() stores the total_bedrooms median, the IQR outlier bounds, the
+    ocean_proximity vocabulary and the processed column layout. transform()
+    reuses them without refitting, so every batch gets the same columns in the
+    same order as the training data.
+
+    ocean_proximity is one-hot encoded with the first category (alphabetically,
+    '<1H OCEAN' in the housing data) dropped, so that category is the all-zero
+    row. Unseen or missing categories also encode as all-zero dummies and are
+    therefore indistinguishable from it; transform() warns about them by
+    default, or raises with handle_unknown='error'.
+
+    Parameters:
+    - target_col (str): Target column, passed through when present
+    """
+
+    def __init__(self, target_col='median_house_value'):
+        self.target_col = target_col
+        self.median_total_bedrooms = None
+        self.bounds = None
+        self.categories = None
+        self.columns = None
+
+    def fit(self, df):
+        """Learning the statistics and column layout from raw training data."""
+        df = df.copy()
+        self.median_total_bedrooms = float(df['total_bedrooms'].median())
+        df['total_bedrooms'] = df['total_bedrooms'].fillna(self.median_total_bedrooms)
+
+        self.bounds = compute_outlier_bounds(df)
+        self.categories = sorted(df['ocean_proximity'].dropna().unique())
+
+        encoded = _encode_ocean_proximity(create_features(df.head(0)), self.categories)
+        self.columns = list(encoded.columns)
+        return self
+
+    @property
+    def feature_names(self):
+        """Model input columns, in training order."""
+        self._check_fitted()
+        return [col for col in self.columns if col != self.target_col]
+
+    def transform(self, df, drop_outliers=False, handle_unknown='warn'):
+        """
+        Applying the fitted preprocessing to raw rows.
+
+        Parameters:
+        - df (pd.DataFrame): Raw records with the columns of data/raw/housing.csv
+        - drop_outliers (bool): Whether to filter rows outside the fitted bounds,
+          as during training. Inference keeps every row.
+        - handle_unknown (str): What to do with unseen or missing ocean_proximity
+          values, which encode like the dropped first category: 'warn', 'error'
+          or 'ignore'
+        """
+        self._check_fitted()
+        if handle_unknown not in ('warn', 'error', 'ignore'):
+            raise ValueError(f"handle_unknown must be 'warn', 'error' or 'ignore', got {handle_unknown!r}")
+        missing = [col for col in RAW_FEATURES if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing input columns: {missing}")
+
+        df = df.copy()
+        if 'ocean_proximity' not in df.columns:
+            df['ocean_proximity'] = np.nan
+        df['total_bedrooms'] = df['total_bedrooms'].fillna(self.median_total_bedrooms)
+
+        if drop_outliers:
+            df = df[outlier_mask(df, self.bounds)]
+
+        if handle_unknown != 'ignore':
+            self._check_categories(df['ocean_proximity'], handle_unknown)
+
+        df = create_features(df)
+        df = _encode_ocean_proximity(df, self.categories)
+
+        columns = self.columns if self.target_col in df.columns else self.feature_names
+        return df[columns]
+
+    def _check_categories(self, values, handle_unknown):
+        """Warning about or rejecting ocean_proximity values outside the fitted vocabulary."""
+        unknown = ~values.isin(self.categories)
+        if not unknown.any():
+            return
+        found = sorted(values[unknown].fillna('<missing>').astype(str).unique())
+        message = (f"{int(unknown.sum())} row(s) with unseen or missing ocean_proximity {found}, "
+                   f"encoded as the baseline category {self.categories[0]!r}")
+        if handle_unknown == 'error':
+            raise ValueError(message)
+        warnings.warn(message, stacklevel=3)
+
+    def fit_transform(self, df):
+        """Fitting on raw data and returning it processed like preprocess_data."""
+        return self.fit(df).transform(df, drop_outliers=True)
+
+    def transform_batches(self, df, batch_size=100_000, handle_unknown='warn'):
+        """Yielding transformed batches of a large frame or of an iterable of chunks."""
+        if isinstance(df, pd.DataFrame):
+            batches = (df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size))
+        else:
+            batches = df
+        for batch in batches:
+            yield self.transform(batch, handle_unknown=handle_unknown)
+
+    def save(self, path):
+        """Saving the fitted statistics to a JSON file."""
+        self._check_fitted()
+        state = {
+            'target_col': self.target_col,
+            'median_total_bedrooms': self.median_total_bedrooms,
+            'bounds': self.bounds,
+            'categories': self.categories,
+            'columns': self.columns
+        }
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=4)
+
+    @classmethod
+    def load(cls, path):
+        """Loading a preprocessor saved with save()."""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Preprocessor file not found at: {path}")
+
+        preprocessor = cls(target_col=state['target_col'])
+        preprocessor.median_total_bedrooms = state['median_total_bedrooms']
+        preprocessor.bounds = {col: tuple(b) for col, b in state['bounds'].items()}
+        preprocessor.categories = state['categories']
+        preprocessor.columns = state['columns']
+        return preprocessor
+
+    @classmethod
+    def from_statistics(cls, stats, columns, target_col='median_house_value'):
+        """
+        Building a fitted preprocessor from statistics computed elsewhere.
+
+        Parameters:
+        - stats (dict): 'median_total_bedrooms', 'bounds' and 'categories', as
+          returned by fit_chunked_statistics or preprocess_data_incremental
+        - columns (list): Processed column layout, e.g. the processed CSV header
+        """
+        preprocessor = cls(target_col=target_col)
+        preprocessor.median_total_bedrooms = float(stats['median_total_bedrooms'])
+        preprocessor.bounds = {col: tuple(b) for col, b in stats['bounds'].items()}
+        preprocessor.categories = list(stats['categories'])
+        preprocessor.columns = list(columns)
+        return preprocessor
+
+    def _check_fitted(self):
+        if self.columns is None:
+            raise ValueError("HousingPreprocessor is not fitted yet, call fit() first")
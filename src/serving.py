@@ -0,0 +1,375 @@
+"""
+Local HTTP prediction service over the models saved in reports/models.
+
+Built on asyncio and the standard library only. Concurrent requests are
+coalesced into micro-batches, bounded by size and wait time, so the
+preprocessor and the model run once per batch instead of once per request.
+
+Run from the project root:
+    python -m src.serving --models-dir reports/models --port 8000
+
+Endpoints:
+- POST /predict?model=random_forest   body: one raw record, a list of records,
+  or {"records": [...]}; returns {"model": ..., "predictions": [...]}
+- GET /metrics                         latency percentiles, throughput and batch counters
+- GET /health                          loaded models
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import time
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from .preprocessor import HousingPreprocessor, RAW_FEATURES
+
+PREPROCESSOR_FILE = 'preprocessor.json'
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def parse_records(payload):
+    """
+    Turning a request body into a DataFrame of raw records, rejecting invalid input.
+
+    Every RAW_FEATURES column must be present and numeric; only total_bedrooms
+    may be missing, as the preprocessor imputes it. Raises ValueError otherwise,
+    so a bad request never reaches a batch shared with other requests.
+    """
+    if isinstance(payload, dict) and 'records' in payload:
+        payload = payload['records']
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list) or not payload or not all(isinstance(r, dict) for r in payload):
+        raise ValueError('Expected a record, a list of records or {"records": [...]}')
+
+    records = pd.DataFrame(payload)
+    missing = [col for col in RAW_FEATURES if col not in records.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {missing}")
+    for col in RAW_FEATURES:
+        values = pd.to_numeric(records[col], errors='coerce')
+        invalid = values.isna() & (records[col].notna() | (col != 'total_bedrooms'))
+        if invalid.any():
+            raise ValueError(f"Column '{col}' must be numeric, invalid in records "
+                             f"{np.flatnonzero(invalid.to_numpy()).tolist()}")
+        records[col] = values.astype(np.float64)
+    return records
+
+
+class ModelRegistry:
+    """
+    Loading the pickled models and the fitted preprocessor once, reloading changed files.
+
+    Parameters:
+    - models_dir (str): Directory with <name>.pkl models and preprocessor.json
+    """
+
+    def __init__(self, models_dir):
+        self.models_dir = models_dir
+        self.models = {}
+        self.preprocessor = None
+        self.reloads = 0
+        self._mtimes = {}
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """Reloading every model or preprocessor file whose mtime changed. Returns changed names."""
+        initial = not self._mtimes
+        changed = []
+        for filename in sorted(os.listdir(self.models_dir)):
+            path = os.path.join(self.models_dir, filename)
+            if not (filename.endswith('.pkl') or filename == PREPROCESSOR_FILE):
+                continue
+            mtime = os.stat(path).st_mtime_ns
+            if self._mtimes.get(path) == mtime:
+                continue
+
+            if filename == PREPROCESSOR_FILE:
+                self.preprocessor = HousingPreprocessor.load(path)
+            else:
+                with open(path, 'rb') as f:
+                    self.models[filename[:-len('.pkl')]] = pickle.load(f)
+            self._mtimes[path] = mtime
+            changed.append(filename)
+
+        if changed and not initial:
+            self.reloads += 1
+        if self.preprocessor is None:
+            raise FileNotFoundError(f"Preprocessor not found in: {self.models_dir}")
+        return changed
+
+    def predict(self, name, records):
+        """Preprocessing raw records and predicting them with one model. A target column is ignored."""
+        model = self.models[name]
+        features = self.preprocessor.transform(records)[self.preprocessor.feature_names]
+        return np.asarray(model.predict(features))
+
+
+class MicroBatcher:
+    """
+    Coalescing concurrent prediction requests for one model into batches.
+
+    A batch is sent to the model once it holds max_batch_size rows or the
+    oldest request has waited max_wait_ms. Prediction runs in a worker thread
+    so the event loop keeps accepting requests. If a batch fails, its
+    requests are retried one by one, so only the failing ones get the error.
+    """
+
+    def __init__(self, registry, name, stats, max_batch_size=512, max_wait_ms=5):
+        self.registry = registry
+        self.name = name
+        self.stats = stats
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def predict(self, records):
+        """Queueing records and waiting for their predictions."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+
+            frames = [records for records, _ in batch]
+            try:
+                predictions = await loop.run_in_executor(
+                    None, self.registry.predict, self.name, pd.concat(frames, ignore_index=True)
+                )
+            except Exception as e:
+                if len(batch) == 1:
+                    self._resolve(batch[0][1], exception=e)
+                else:
+                    await self._run_each(batch)
+                continue
+
+            self.stats.record_batch(rows)
+            offset = 0
+            for records, future in batch:
+                self._resolve(future, predictions[offset:offset + len(records)])
+                offset += len(records)
+
+    async def _run_each(self, batch):
+        """Predicting the requests of a failed batch one at a time."""
+        loop = asyncio.get_running_loop()
+        for records, future in batch:
+            try:
+                predictions = await loop.run_in_executor(None, self.registry.predict, self.name, records)
+            except Exception as e:
+                self._resolve(future, exception=e)
+                continue
+            self.stats.record_batch(len(records))
+            self._resolve(future, predictions)
+
+    @staticmethod
+    def _resolve(future, result=None, exception=None):
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def close(self):
+        self._task.cancel()
+
+
+class ServerStats:
+    """Tracking request latencies, throughput and batch sizes."""
+
+    def __init__(self, window=10_000):
+        self.started = time.perf_counter()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+
+    def record_request(self, latency, rows):
+        self.requests += 1
+        self.rows += rows
+        self.latencies.append(latency)
+
+    def record_batch(self, rows):
+        self.batches += 1
+        self.batch_rows += rows
+
+    def snapshot(self):
+        """Returning the current counters as a JSON-serializable dict."""
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            'uptime_s': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'rows': self.rows,
+            'batches': self.batches,
+            'mean_batch_rows': self.batch_rows / self.batches if self.batches else 0.0,
+            'requests_per_s': self.requests / uptime,
+            'rows_per_s': self.rows / uptime,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p99_ms': float(np.percentile(latencies, 99))
+        }
+
+
+class PredictionServer:
+    """
+    Serving the registry's models over HTTP with micro-batching and hot reload.
+
+    Parameters:
+    - models_dir (str): Directory with the pickled models and preprocessor.json
+    - max_batch_size (int): Maximum rows per model call
+    - max_wait_ms (float): Maximum time a request waits for its batch to fill
+    - reload_interval (float): Seconds between checks for changed model files
+    """
+
+    def __init__(self, models_dir, max_batch_size=512, max_wait_ms=5, reload_interval=2.0):
+        self.registry = ModelRegistry(models_dir)
+        self.stats = ServerStats()
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.reload_interval = reload_interval
+        self._batchers = {}
+
+    def _batcher(self, name):
+        if name not in self._batchers:
+            self._batchers[name] = MicroBatcher(self.registry, name, self.stats,
+                                                self.max_batch_size, self.max_wait_ms)
+        return self._batchers[name]
+
+    async def _watch_models(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                changed = await loop.run_in_executor(None, self.registry.reload_if_changed)
+            except Exception as e:
+                print(f"Reload failed, keeping previous models: {e}")
+                continue
+            if changed:
+                print(f"Reloaded: {', '.join(changed)}")
+
+    async def handle_predict(self, query, body):
+        name = query.get('model', ['random_forest'])[0]
+        if name not in self.registry.models:
+            return 404, {'error': f"Unknown model '{name}'",
+                         'models': sorted(self.registry.models)}
+
+        try:
+            records = parse_records(json.loads(body or b'null'))
+        except ValueError as e:
+            self.stats.errors += 1
+            return 400, {'error': str(e)}
+
+        start = time.perf_counter()
+        predictions = await self._batcher(name).predict(records)
+        self.stats.record_request(time.perf_counter() - start, len(records))
+        return 200, {'model': name, 'predictions': [float(p) for p in predictions]}
+
+    async def handle(self, method, path, body):
+        """Routing one request to its handler. Returns (status, JSON body)."""
+        url = urlparse(path)
+        if method == 'POST' and url.path == '/predict':
+            return await self.handle_predict(parse_qs(url.query), body)
+        if method == 'GET' and url.path == '/metrics':
+            return 200, self.stats.snapshot()
+        if method == 'GET' and url.path == '/health':
+            return 200, {'status': 'ok', 'models': sorted(self.registry.models),
+                         'reloads': self.registry.reloads}
+        return 404, {'error': f"No route for {method} {url.path}"}
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                try:
+                    status, response = await self.handle(method, path, body)
+                except Exception as e:
+                    self.stats.errors += 1
+                    status, response = 500, {'error': str(e)}
+
+                data = json.dumps(response).encode()
+                reason = REASONS[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        """Running the server until cancelled."""
+        server = await asyncio.start_server(self._client, host, port)
+        watcher = asyncio.create_task(self._watch_models())
+        print(f"Serving {', '.join(sorted(self.registry.models))} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            for batcher in self._batchers.values():
+                batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the saved housing price models over HTTP.")
+    parser.add_argument('--models-dir', default='reports/models')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=512)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    parser.add_argument('--reload-interval', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = PredictionServer(args.models_dir, args.max_batch_size,
+                              args.max_wait_ms, args.reload_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
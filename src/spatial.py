@@ -0,0 +1,173 @@
+"""
+Neighborhood features from a spatial index over district coordinates.
+
+A ball tree (haversine distance) or KD-tree (local km projection) on
+longitude/latitude answers k-nearest-neighbor and radius queries in
+O(log n) per row, instead of comparing every district with every other one.
+Queries run in batches, and neighbor sums are reduced with bincount.
+
+Target-based aggregates (mean neighbor price) are computed out of fold on
+the training rows: each fold is queried against a tree built on the other
+folds, so no row sees its own price. The other aggregates come from the tree
+on all training rows with the row itself left out, so training rows see the
+same neighbor density as new rows. New rows are queried against the tree on
+all training rows, which is saved with the features for inference.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold
+from sklearn.neighbors import BallTree, KDTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+NEIGHBOR_FEATURES = [
+    'knn_mean_price', 'knn_mean_income', 'knn_mean_distance_km',
+    'radius_count', 'radius_mean_price'
+]
+# Columns of NEIGHBOR_FEATURES that use the target and are built out of fold
+TARGET_FEATURES = [NEIGHBOR_FEATURES.index(name) for name in ('knn_mean_price', 'radius_mean_price')]
+
+
+class NeighborFeatures:
+    """
+    Adding k-nearest-neighbor and radius aggregates of price and income.
+
+    Parameters:
+    - k (int): Neighbors for the knn_* features
+    - radius_km (float): Radius for the radius_* features
+    - n_splits (int): Folds for the out-of-fold training features
+    - batch_size (int): Rows per tree query
+    - algorithm (str): 'ball_tree' (haversine) or 'kd_tree' (equirectangular km)
+    - random_state (int): Seed for the fold assignment
+    """
+
+    def __init__(self, k=10, radius_km=5.0, n_splits=5, batch_size=10_000,
+                 algorithm='ball_tree', random_state=42):
+        if algorithm not in ('ball_tree', 'kd_tree'):
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        self.k = k
+        self.radius_km = radius_km
+        self.n_splits = n_splits
+        self.batch_size = batch_size
+        self.algorithm = algorithm
+        self.random_state = random_state
+        self.tree_ = None
+
+    def _coords(self, X):
+        lon = np.radians(X['longitude'].to_numpy(dtype=np.float64))
+        lat = np.radians(X['latitude'].to_numpy(dtype=np.float64))
+        if self.algorithm == 'ball_tree':
+            return np.column_stack([lat, lon])
+        return np.column_stack([lon * np.cos(self.reference_lat_), lat]) * EARTH_RADIUS_KM
+
+    def _build(self, coords):
+        if self.algorithm == 'ball_tree':
+            return BallTree(coords, metric='haversine')
+        return KDTree(coords)
+
+    def _to_km(self, distance):
+        return distance * EARTH_RADIUS_KM if self.algorithm == 'ball_tree' else distance
+
+    def _radius(self):
+        return self.radius_km / EARTH_RADIUS_KM if self.algorithm == 'ball_tree' else self.radius_km
+
+    def _aggregate(self, tree, coords, price, income, self_index=None):
+        """
+        Querying coords against tree in batches; price and income belong to the tree's rows.
+
+        self_index gives, for coords that are rows of the tree, their position
+        in it; each such row is then left out of its own neighbors.
+        """
+        n_tree = tree.data.shape[0]
+        k = min(self.k, n_tree - (self_index is not None))
+        out = np.empty((len(coords), len(NEIGHBOR_FEATURES)))
+
+        for start in range(0, len(coords), self.batch_size):
+            batch = coords[start:start + self.batch_size]
+            rows = slice(start, start + len(batch))
+
+            if self_index is None:
+                distance, index = tree.query(batch, k=k)
+            else:
+                distance, index = tree.query(batch, k=k + 1)
+                # Drop the row itself; with duplicate coordinates it may be beyond column k
+                own = index == self_index[rows, None]
+                own[~own.any(axis=1), -1] = True
+                distance = distance[~own].reshape(len(batch), k)
+                index = index[~own].reshape(len(batch), k)
+            out[rows, 0] = price[index].mean(axis=1)
+            out[rows, 1] = income[index].mean(axis=1)
+            out[rows, 2] = self._to_km(distance).mean(axis=1)
+
+            neighbors = tree.query_radius(batch, r=self._radius())
+            counts = np.fromiter((len(n) for n in neighbors), dtype=np.int64, count=len(batch))
+            flat = np.concatenate(neighbors) if counts.sum() else np.empty(0, dtype=np.int64)
+            sums = np.bincount(np.repeat(np.arange(len(batch)), counts),
+                               weights=price[flat], minlength=len(batch))
+            if self_index is not None:
+                # The row itself is always inside the radius
+                counts -= 1
+                sums -= price[self_index[rows]]
+            out[rows, 3] = counts
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out[rows, 4] = np.where(counts > 0, sums / counts, np.nan)
+
+        # Districts with no neighbor inside the radius fall back to their k-NN mean
+        empty = np.isnan(out[:, 4])
+        out[empty, 4] = out[empty, 0]
+        return out
+
+    def _frame(self, X, values):
+        features = pd.DataFrame(values, columns=NEIGHBOR_FEATURES, index=X.index)
+        return pd.concat([X, features], axis=1)
+
+    def fit(self, X, y):
+        """Building the index on the training districts."""
+        self.reference_lat_ = float(np.radians(X['latitude'].mean()))
+        self.coords_ = self._coords(X)
+        self.price_ = np.asarray(y, dtype=np.float64)
+        self.income_ = X['median_income'].to_numpy(dtype=np.float64)
+        self.tree_ = self._build(self.coords_)
+        return self
+
+    def transform(self, X):
+        """Appending the neighbor features of new districts, looked up among all training districts."""
+        if self.tree_ is None:
+            raise ValueError("NeighborFeatures is not fitted yet, call fit() first")
+        return self._frame(X, self._aggregate(self.tree_, self._coords(X), self.price_, self.income_))
+
+    def fit_transform(self, X, y):
+        """
+        Fitting on the training districts and returning their neighbor features.
+
+        Price aggregates are out of fold; the others are looked up in the full
+        tree, leaving each district out of its own neighbors.
+        """
+        self.fit(X, y)
+        values = self._aggregate(self.tree_, self.coords_, self.price_, self.income_,
+                                 self_index=np.arange(len(X)))
+        folds = KFold(self.n_splits, shuffle=True, random_state=self.random_state)
+        for other, own in folds.split(self.coords_):
+            tree = self._build(self.coords_[other])
+            oof = self._aggregate(tree, self.coords_[own], self.price_[other], self.income_[other])
+            values[np.ix_(own, TARGET_FEATURES)] = oof[:, TARGET_FEATURES]
+        return self._frame(X, values)
+
+    def save(self, path):
+        """Saving the fitted index, including the built tree, so loading needs no rebuild."""
+        if self.tree_ is None:
+            raise ValueError("NeighborFeatures is not fitted yet, call fit() first")
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path):
+        """Loading an index saved with save()."""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Spatial index not found at: {path}")
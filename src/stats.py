@@ -0,0 +1,344 @@
+"""
+Single-pass, mergeable dataset statistics for exploration and correlation.
+
+One chunked pass over a CSV collects everything the exploration and EDA
+scripts print: per-column counts, mean, standard deviation, min/max and
+quartiles, missing values, value counts of the text columns, the number of
+duplicate rows and the pairwise correlation matrix. Every accumulator merges,
+so the file is split into byte ranges that are scanned in parallel and
+combined, and the finished statistics are cached next to the dataset cache.
+
+Usage:
+    stats = compute_stats("data/raw/housing.csv", cache_dir="data/cache")
+    stats.describe()
+    stats.corr()
+"""
+
+import hashlib
+import io
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cache import cache_key
+from .instrumentation import instrument
+from .streaming import RowReservoir
+
+# Bump when the cached statistics change layout
+STATS_VERSION = 1
+
+
+class DatasetStats:
+    """
+    Accumulating statistics over chunks of a dataset.
+
+    Means and variances use Chan et al.'s pairwise update of Welford's
+    moments. Correlations come from co-moment sums over pairwise-complete rows,
+    shifted by a fixed reference point for numerical stability (accumulators
+    only merge when they share it). Duplicate rows are counted from 64-bit row
+    hashes, quartiles from a row reservoir (exact up to sample_size rows).
+
+    Parameters:
+    - columns (list): Column names in file order
+    - numeric (list): Numeric and boolean columns to take moments of
+    - shift (array): Reference point subtracted before summing co-moments;
+      the first chunk's means when None
+    - sample_size (int): Rows kept for the quartiles
+    - random_state (int): Seed for the quartile sample
+    """
+
+    def __init__(self, columns, numeric, shift=None, sample_size=200_000, random_state=42):
+        self.columns = list(columns)
+        self.numeric = list(numeric)
+        self.dtypes = {}
+        self.rows = 0
+        k = len(self.numeric)
+
+        self.missing = pd.Series(0, index=self.columns, dtype=np.int64)
+        self.value_counts_ = {}
+
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+        self.shift = None if shift is None else np.asarray(shift, dtype=np.float64)
+        self.pair_count = np.zeros((k, k))
+        self.pair_sum = np.zeros((k, k))     # [i, j]: sum of x_i over rows where x_j is present
+        self.pair_sum_sq = np.zeros((k, k))
+        self.cross = np.zeros((k, k))
+
+        self.sample = RowReservoir(self.numeric, size=sample_size, random_state=random_state)
+        self._hashes = []
+
+    def update(self, chunk):
+        """Adding one chunk of rows."""
+        if len(chunk) == 0:
+            return self
+        for column in self.columns:
+            self.dtypes.setdefault(column, str(chunk[column].dtype))
+        self.rows += len(chunk)
+        self.missing += chunk.isna().sum().reindex(self.columns).to_numpy()
+
+        for column in self.columns:
+            if column not in self.numeric:
+                counts = chunk[column].value_counts()
+                totals = self.value_counts_.setdefault(column, {})
+                for value, n in counts.items():
+                    totals[value] = totals.get(value, 0) + int(n)
+
+        values = chunk[self.numeric].astype(np.float64).to_numpy()
+        present = ~np.isnan(values)
+        self._update_moments(values, present)
+        self._update_comoments(values, present)
+
+        self.sample.update(pd.DataFrame(values, columns=self.numeric))
+        self._hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+        if len(self._hashes) > 64:
+            self._compact()
+        return self
+
+    def _update_moments(self, values, present):
+        n = present.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk_mean = np.where(n > 0, np.nansum(values, axis=0) / n, 0.0)
+        chunk_m2 = np.nansum((values - chunk_mean) ** 2, axis=0)
+        self._merge_moments(n, chunk_mean, chunk_m2)
+        if len(values):
+            self.min = np.minimum(self.min, np.where(present, values, np.inf).min(axis=0))
+            self.max = np.maximum(self.max, np.where(present, values, -np.inf).max(axis=0))
+
+    def _merge_moments(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, n / total, 0.0)
+        self.m2 += m2 + delta ** 2 * self.count * weight
+        self.mean += delta * weight
+        self.count = total
+
+    def _update_comoments(self, values, present):
+        if self.shift is None:
+            n = present.sum(axis=0)
+            self.shift = np.where(n > 0, np.where(present, values, 0.0).sum(axis=0) / np.maximum(n, 1), 0.0)
+        shifted = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(np.float64)
+        self.pair_count += mask.T @ mask
+        self.pair_sum += shifted.T @ mask
+        self.pair_sum_sq += (shifted ** 2).T @ mask
+        self.cross += shifted.T @ shifted
+
+    def _compact(self):
+        if self._hashes:
+            self._hashes = [np.unique(np.concatenate(self._hashes))]
+
+    def merge(self, other):
+        """Combining the statistics of another partition into this one."""
+        if self.numeric != other.numeric or self.columns != other.columns:
+            raise ValueError("Cannot merge statistics of different columns")
+        if other.rows == 0:
+            return self
+        if self.rows == 0:
+            self.shift = other.shift
+        elif not np.array_equal(self.shift, other.shift):
+            raise ValueError("Cannot merge statistics with different shift points")
+
+        for column, dtype in other.dtypes.items():
+            self.dtypes.setdefault(column, dtype)
+        self.rows += other.rows
+        self.missing += other.missing
+        for column, counts in other.value_counts_.items():
+            totals = self.value_counts_.setdefault(column, {})
+            for value, n in counts.items():
+                totals[value] = totals.get(value, 0) + n
+
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+        self.pair_count += other.pair_count
+        self.pair_sum += other.pair_sum
+        self.pair_sum_sq += other.pair_sum_sq
+        self.cross += other.cross
+
+        self.sample.merge(other.sample)
+        self._hashes = self._hashes + other._hashes
+        self._compact()
+        return self
+
+    @property
+    def numeric_columns(self):
+        """Numeric columns other than booleans, the ones describe() reports."""
+        return [c for c in self.numeric if self.dtypes.get(c) != 'bool']
+
+    @property
+    def duplicates(self):
+        """Number of rows identical to an earlier row."""
+        self._compact()
+        unique = len(self._hashes[0]) if self._hashes else 0
+        return self.rows - unique
+
+    def std(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan),
+                             index=self.numeric)
+
+    def describe(self):
+        """Returning the same table as DataFrame.describe() for the numeric columns."""
+        columns = self.numeric_columns
+        idx = [self.numeric.index(c) for c in columns]
+        sample = self.sample.to_frame()[columns].to_numpy()
+        with np.errstate(invalid='ignore'):
+            quartiles = (np.nanquantile(sample, [0.25, 0.5, 0.75], axis=0)
+                         if len(sample) else np.full((3, len(columns)), np.nan))
+        count = self.count[idx]
+        table = np.vstack([
+            count,
+            np.where(count > 0, self.mean[idx], np.nan),
+            self.std().to_numpy()[idx],
+            np.where(count > 0, self.min[idx], np.nan),
+            quartiles,
+            np.where(count > 0, self.max[idx], np.nan)
+        ])
+        return pd.DataFrame(table, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                            columns=columns)
+
+    def value_counts(self, column):
+        """Returning the counts of every value of a text column, largest first."""
+        counts = pd.Series(self.value_counts_[column], name='count', dtype=np.int64)
+        counts.index.name = column
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def corr(self, columns=None):
+        """Returning the Pearson correlation matrix over pairwise-complete rows, like DataFrame.corr()."""
+        n = self.pair_count
+        s = self.pair_sum
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.cross - s * s.T / n
+            var = self.pair_sum_sq - s ** 2 / n
+            corr = cov / np.sqrt(var * var.T)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(var) > 0, 1.0, np.nan))
+        result = pd.DataFrame(corr, index=self.numeric, columns=self.numeric)
+        if columns is not None:
+            result = result.loc[columns, columns]
+        return result
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._remaining)
+        data = self._file.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _partition_offsets(file_path, n_partitions):
+    """Splitting the data rows of a CSV into byte ranges that start on line boundaries."""
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        f.readline()
+        offsets = [f.tell()]
+        for p in range(1, n_partitions):
+            f.seek(max(size * p // n_partitions, offsets[-1]))
+            f.readline()
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+    return sorted(set(offsets))
+
+
+def _scan_partition(file_path, start, end, columns, dtypes, numeric, shift, chunksize,
+                    sample_size, random_state):
+    """Accumulating the statistics of one byte range; runs inside the worker processes."""
+    stats = DatasetStats(columns, numeric, shift=shift, sample_size=sample_size,
+                         random_state=random_state)
+    with io.BufferedReader(_ByteRange(file_path, start, end)) as f:
+        for chunk in pd.read_csv(f, header=None, names=columns, dtype=dtypes, chunksize=chunksize):
+            stats.update(chunk)
+    return stats
+
+
+def _stats_path(cache_dir, file_path):
+    source = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f'stats-{source}.pkl')
+
+
+@instrument
+def compute_stats(file_path, chunksize=100_000, n_jobs=None, cache_dir=None,
+                  sample_size=200_000, random_state=42):
+    """
+    Computing DatasetStats for a CSV in one parallel, chunked pass.
+
+    The data rows are split into n_jobs byte ranges (all cores by default)
+    that are scanned in worker processes and merged. Column types come from
+    the first rows; numeric and boolean columns get moments and correlations,
+    the others value counts. Rows must not contain quoted line breaks.
+
+    With cache_dir, the result is stored there and reused until the file or
+    the parameters change.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+
+    params = {'stats': STATS_VERSION, 'sample_size': sample_size, 'random_state': random_state}
+    if cache_dir is not None:
+        key = cache_key(file_path, params)
+        path = _stats_path(cache_dir, file_path)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['key'] == key:
+                return cached['stats']
+
+    head = pd.read_csv(file_path, nrows=1000)
+    columns = head.columns.tolist()
+    numeric = [c for c in columns
+               if pd.api.types.is_numeric_dtype(head[c]) or pd.api.types.is_bool_dtype(head[c])]
+    dtypes = {c: (np.float64 if c in numeric and not pd.api.types.is_bool_dtype(head[c]) else
+                  'boolean' if c in numeric else object)
+              for c in columns}
+    shift = np.nan_to_num(head[numeric].astype(np.float64).mean().to_numpy())
+
+    workers = n_jobs or os.cpu_count() or 1
+    offsets = _partition_offsets(file_path, workers)
+    jobs = [(file_path, start, end, columns, dtypes, numeric, shift, chunksize, sample_size,
+             random_state + i)
+            for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:]))]
+
+    if len(jobs) <= 1:
+        parts = [_scan_partition(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            parts = list(pool.map(_scan_partition, *zip(*jobs)))
+
+    stats = DatasetStats(columns, numeric, shift=shift, sample_size=sample_size,
+                         random_state=random_state)
+    for part in parts:
+        stats.merge(part)
+    # Report the column types the file was read with
+    stats.dtypes = {c: str(head[c].dtype) for c in columns}
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({'key': key, 'stats': stats}, f)
+    return stats
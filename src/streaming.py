@@ -0,0 +1,96 @@
+"""
+Bounded-memory helpers for processing datasets that do not fit in memory.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+
+class RowReservoir:
+    """
+    Keeping a uniform random sample of rows from a stream of chunks.
+
+    Every row gets a random key and the reservoir keeps the `size` rows with
+    the smallest keys (bottom-k sampling). Memory stays at `size` rows no
+    matter how long the stream is, and while fewer than `size` rows have been
+    seen the reservoir holds all of them, so statistics computed on it are exact.
+
+    Parameters:
+    - columns (list): Numeric column names to keep
+    - size (int): Maximum number of rows held
+    - random_state (int): Seed for the sampling keys
+    """
+
+    def __init__(self, columns, size=200_000, random_state=42):
+        self.columns = list(columns)
+        self.size = size
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(random_state)
+        self._keys = np.empty(0)
+        self._values = np.empty((0, len(self.columns)))
+
+    def update(self, df):
+        """Adding the rows of a chunk to the sample."""
+        values = df[self.columns].to_numpy(dtype=np.float64)
+        keys = self._rng.random(len(values))
+        self.rows_seen += len(values)
+
+        self._add(keys, values)
+        return self
+
+    def merge(self, other):
+        """
+        Combining a reservoir filled from another part of the stream.
+
+        Keeping the smallest keys of both is again a uniform sample of all rows
+        seen, provided the two reservoirs were seeded differently.
+        """
+        self.rows_seen += other.rows_seen
+        self._add(other._keys, other._values)
+        return self
+
+    def _add(self, keys, values):
+        self._keys = np.concatenate([self._keys, keys])
+        self._values = np.vstack([self._values, values])
+
+        if len(self._keys) > self.size:
+            keep = np.argpartition(self._keys, self.size)[:self.size]
+            self._keys = self._keys[keep]
+            self._values = self._values[keep]
+
+    @property
+    def is_exact(self):
+        """True while the reservoir still holds every row seen."""
+        return self.rows_seen <= self.size
+
+    def to_frame(self):
+        """Returning the sampled rows as a DataFrame."""
+        return pd.DataFrame(self._values, columns=self.columns)
+
+    def save(self, path):
+        """
+        Saving the sample, its keys and the generator state to an .npz file.
+
+        A loaded reservoir continues the same random stream, so updating it
+        with appended rows gives the sample a single pass would have kept.
+        """
+        np.savez(path, keys=self._keys, values=self._values,
+                 columns=np.array(self.columns, dtype=str), size=self.size,
+                 rows_seen=self.rows_seen,
+                 rng_state=np.array(json.dumps(self._rng.bit_generator.state)))
+
+    @classmethod
+    def load(cls, path):
+        """Loading a reservoir saved with save()."""
+        try:
+            data = np.load(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Reservoir file not found at: {path}")
+        reservoir = cls(data['columns'].tolist(), size=int(data['size']))
+        reservoir.rows_seen = int(data['rows_seen'])
+        reservoir._keys = data['keys']
+        reservoir._values = data['values']
+        reservoir._rng.bit_generator.state = json.loads(str(data['rng_state']))
+        return reservoir
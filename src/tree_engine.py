@@ -0,0 +1,161 @@
+"""
+Array-backed inference engine for trained decision trees and random forests.
+
+A fitted DecisionTreeRegressor or RandomForestRegressor is flattened into
+contiguous NumPy node arrays shared by all trees. Prediction walks every
+(row, tree) pair one level per step with vectorized gathers, so a whole batch
+is scored across all trees at once without sklearn's per-call validation and
+per-tree dispatch.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FlatForest:
+    """
+    Trees stored as flat node arrays.
+
+    Leaves point to themselves with an infinite threshold, so traversal can run
+    a fixed number of steps (the deepest tree's depth) without branching on
+    whether a row has already reached its leaf.
+
+    Attributes:
+    - feature (int32): Split feature per node
+    - threshold (float64): Split threshold per node, go left when x <= threshold
+    - left, right (int32): Global child node ids
+    - value (float64): Mean target of the training samples in each node
+    - roots (int32): Root node id of every tree
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        # Interleaved [right, left] children so one gather picks the next node
+        self._children = np.stack([right, left], axis=1).ravel()
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flattening a fitted DecisionTreeRegressor or RandomForestRegressor."""
+        # Imported here so loading a saved FlatForest does not need sklearn
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.tree import DecisionTreeRegressor
+
+        if isinstance(model, RandomForestRegressor):
+            trees = [estimator.tree_ for estimator in model.estimators_]
+        elif isinstance(model, DecisionTreeRegressor):
+            trees = [model.tree_]
+        else:
+            raise ValueError(f"Unsupported model type: {type(model).__name__}")
+        if trees[0].value.shape[1] != 1:
+            raise ValueError("Only single-output regressors are supported")
+
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            ids = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, ids, tree.children_left + offset).astype(np.int32))
+            right.append(np.where(is_leaf, ids, tree.children_right + offset).astype(np.int32))
+            value.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            value=np.concatenate(value).astype(np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=max(tree.max_depth for tree in trees),
+            feature_names=getattr(model, 'feature_names_in_', None)
+        )
+
+    def _as_array(self, X):
+        """Converting input to the float32 matrix sklearn trees compare against."""
+        if isinstance(X, pd.DataFrame) and self.feature_names is not None:
+            X = X[self.feature_names]
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def leaves(self, X):
+        """Returning the leaf node id reached by every row in every tree, shape (rows, trees)."""
+        X = self._as_array(X)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+
+        for _ in range(self.max_depth):
+            go_left = flat_X[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self._children[2 * nodes + go_left]
+        return nodes
+
+    def predict(self, X, batch_size=4096):
+        """
+        Predicting a batch, averaging the trees like RandomForestRegressor.
+
+        Rows are processed batch_size at a time to bound the (rows, trees)
+        working arrays.
+        """
+        X = self._as_array(X)
+        out = np.empty(len(X))
+        for start in range(0, len(X), batch_size):
+            values = self.value[self.leaves(X[start:start + batch_size])]
+            # Accumulate tree by tree in order, as sklearn does
+            total = np.zeros(len(values))
+            for t in range(self.n_trees):
+                total += values[:, t]
+            out[start:start + batch_size] = total / self.n_trees
+        return out
+
+    def save(self, path):
+        """Saving the node arrays to an .npz file."""
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                 right=self.right, value=self.value, roots=self.roots,
+                 max_depth=self.max_depth,
+                 feature_names=np.array(self.feature_names or [], dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loading a FlatForest saved with save() or compression.save_compact().
+
+        Quantized node values are expanded back to float64; thresholds keep
+        their stored precision.
+        """
+        try:
+            data = np.load(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Model file not found at: {path}")
+        names = data['feature_names'].tolist()
+        value = data['value']
+        if 'value_scale' in data:
+            value = value * float(data['value_scale']) + float(data['value_offset'])
+        return cls(data['feature'], data['threshold'], data['left'], data['right'],
+                   value.astype(np.float64), data['roots'], data['max_depth'], names or None)
+
+
+def verify_against_sklearn(model, X, flat=None):
+    """Returning the largest absolute difference between FlatForest and sklearn predictions."""
+    if flat is None:
+        flat = FlatForest.from_sklearn(model)
+    return float(np.max(np.abs(flat.predict(X) - model.predict(X))))
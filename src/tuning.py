@@ -0,0 +1,144 @@
+"""
+Cross-validation and successive-halving hyperparameter search for the models.
+
+Fold indices are computed once and shared by every candidate and every
+worker. Successive halving evaluates all candidates on a small sample of the
+training rows, keeps the best 1/factor and repeats with factor times more
+rows, so poor configurations stop early. Candidates and folds run in
+parallel across cores through joblib.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, KFold, cross_validate
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor
+
+from .instrumentation import instrument
+
+# Estimator, search grid, and the hard-coded configuration used by the train_* functions
+SEARCH_SPACES = {
+    'Linear Regression': (
+        LinearRegression(),
+        {'fit_intercept': [True, False]},
+        {'fit_intercept': True}
+    ),
+    'Decision Tree': (
+        DecisionTreeRegressor(random_state=42),
+        {'max_depth': [6, 8, 10, 12, 15, None], 'min_samples_leaf': [1, 5, 10, 20]},
+        {'max_depth': 10, 'min_samples_leaf': 1}
+    ),
+    'Random Forest': (
+        RandomForestRegressor(random_state=42),
+        {'n_estimators': [50, 100, 200], 'max_depth': [10, 15, None],
+         'min_samples_leaf': [1, 4], 'max_features': [1.0, 0.5]},
+        {'n_estimators': 100, 'max_depth': 15, 'min_samples_leaf': 1, 'max_features': 1.0}
+    )
+}
+
+
+def make_kfold_indices(n_samples, n_splits=5, random_state=42):
+    """Precomputing shuffled k-fold (train, validation) index arrays."""
+    kfold = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return [(train.astype(np.int64), valid.astype(np.int64))
+            for train, valid in kfold.split(np.empty((n_samples, 1)))]
+
+
+@instrument
+def cross_validate_params(estimator, params, X, y, folds, n_jobs=-1):
+    """
+    Cross-validating one configuration on a clone of estimator, which is left unchanged.
+    Returns mean R², its std and the compute seconds.
+    """
+    start = time.perf_counter()
+    scores = cross_validate(clone(estimator).set_params(**params), X, y, cv=folds,
+                            scoring='r2', n_jobs=n_jobs)
+    return {
+        'r2': float(np.mean(scores['test_score'])),
+        'r2_std': float(np.std(scores['test_score'])),
+        'compute_s': float(np.sum(scores['fit_time']) + np.sum(scores['score_time'])),
+        'wall_s': time.perf_counter() - start
+    }
+
+
+@instrument
+def successive_halving_search(estimator, param_grid, X, y, folds, factor=3, min_resources='exhaust',
+                              n_jobs=-1, random_state=42):
+    """
+    Running successive halving over a grid on shared folds.
+
+    Returns the best parameters and score, and one entry per halving round
+    with the candidates kept, the rows used, the compute seconds spent and the
+    best score reached so far.
+    """
+    search = HalvingGridSearchCV(
+        estimator, param_grid, cv=folds, factor=factor, resource='n_samples',
+        min_resources=min_resources, scoring='r2', n_jobs=n_jobs,
+        random_state=random_state, refit=False
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    wall = time.perf_counter() - start
+
+    cv = pd.DataFrame(search.cv_results_)
+    cv['compute_s'] = (cv['mean_fit_time'] + cv['mean_score_time']) * len(folds)
+
+    rounds = []
+    for i, group in cv.groupby('iter'):
+        best = group.loc[group['mean_test_score'].idxmax()]
+        rounds.append({
+            'round': int(i),
+            'candidates': len(group),
+            'rows': int(group['n_resources'].iloc[0]),
+            'compute_s': float(group['compute_s'].sum()),
+            'best_r2': float(best['mean_test_score']),
+            'best_params': best['params']
+        })
+
+    return {
+        'best_params': search.best_params_,
+        'best_r2': float(search.best_score_),
+        'compute_s': float(cv['compute_s'].sum()),
+        'wall_s': wall,
+        'rounds': rounds
+    }
+
+
+@instrument
+def tune_models(X, y, names=None, n_splits=5, factor=3, n_jobs=-1, random_state=42):
+    """
+    Tuning every model in SEARCH_SPACES and comparing against its hard-coded configuration.
+
+    The report per model holds the baseline CV score, the search result and
+    the trade-off: R² gained over the baseline for the compute time spent.
+    """
+    names = names or list(SEARCH_SPACES)
+    folds = make_kfold_indices(len(X), n_splits, random_state)
+    report = {}
+
+    for name in names:
+        estimator, grid, baseline_params = SEARCH_SPACES[name]
+        baseline = cross_validate_params(estimator, baseline_params, X, y, folds, n_jobs)
+        search = successive_halving_search(estimator, grid, X, y, folds, factor=factor,
+                                           n_jobs=n_jobs, random_state=random_state)
+        # Score the winner on all rows and folds, like the baseline
+        best = cross_validate_params(estimator, search['best_params'], X, y, folds, n_jobs)
+
+        gain = best['r2'] - baseline['r2']
+        compute = search['compute_s'] + best['compute_s']
+        report[name] = {
+            'baseline_params': baseline_params,
+            'baseline': baseline,
+            'search': search,
+            'best_params': search['best_params'],
+            'best': best,
+            'r2_gain': gain,
+            'compute_s': compute,
+            'r2_gain_per_compute_hour': gain / (compute / 3600) if compute else 0.0
+        }
+    return report
@@ -1,16 +1,109 @@
 """
 Visualization functions for EDA.
+
+Above AGGREGATE_THRESHOLD rows the point-based plots switch to an aggregated
+mode: hexbin or 2D-histogram binning instead of one marker per row, KDEs
+evaluated on a fixed grid from binned counts, and rasterized artists. Drawing
+cost and file size then depend on the grid, not on the number of rows. Pass
+aggregate=True/False to force either mode, or max_points to draw a
+(stratified) sample instead.
 """
 
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import pandas as pd
+
+from .instrumentation import instrument
+
+AGGREGATE_THRESHOLD = 200_000
+GRID_SIZE = 200
+
+
+def _use_aggregate(df, aggregate):
+    """Resolving aggregate=None to the row-count threshold."""
+    if aggregate is None:
+        return len(df) > AGGREGATE_THRESHOLD
+    return aggregate
+
+
+def stratified_sample(df, n, by=None, bins=10, random_state=42):
+    """
+    Returning about n rows of df, drawn proportionally from every stratum.
+
+    Parameters:
+    - df (pd.DataFrame): Input dataset
+    - n (int): Number of rows to keep
+    - by (str): Column defining the strata; numeric columns are cut into quantile bins.
+      None draws a uniform sample
+    - bins (int): Number of quantile bins for a numeric stratification column
+    - random_state (int): Seed for the sample
+    """
+    if len(df) <= n:
+        return df
+    if by is None:
+        return df.sample(n=n, random_state=random_state)
+
+    strata = df[by]
+    if pd.api.types.is_numeric_dtype(strata):
+        strata = pd.qcut(strata, q=bins, duplicates='drop')
+    # Every row gets a random rank within its stratum; a stratum keeps the rows
+    # ranked within its proportional quota, and at least one so rare groups still show up
+    keys = pd.Series(np.random.default_rng(random_state).random(len(df)), index=df.index)
+    grouped = keys.groupby(strata, observed=True)
+    quota = np.maximum(1, np.round(grouped.transform('size') * n / len(df)))
+    return df[grouped.rank(method='first') <= quota]
+
+
+def _downsample(df, max_points, by=None):
+    if max_points is not None and len(df) > max_points:
+        return stratified_sample(df, max_points, by=by)
+    return df
+
+
+def binned_kde(values, grid_size=GRID_SIZE, bounds=None):
+    """
+    Evaluating a Gaussian KDE on a fixed grid from binned counts.
+
+    The values are counted into grid_size bins and the counts convolved with a
+    Gaussian kernel using Scott's bandwidth (never narrower than one bin), so
+    the cost is one pass over the data plus O(grid_size²).
+
+    Returns (grid, density).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    lo, hi = bounds if bounds is not None else (values.min(), values.max())
+    if hi <= lo:
+        hi = lo + 1.0
+
+    counts, edges = np.histogram(values, bins=grid_size, range=(lo, hi))
+    grid = (edges[:-1] + edges[1:]) / 2
+    step = edges[1] - edges[0]
+    bandwidth = max(1.06 * values.std() * len(values) ** -0.2, step) if len(values) > 1 else step
+
+    offsets = (np.arange(-grid_size + 1, grid_size) * step) / bandwidth
+    kernel = np.exp(-0.5 * offsets ** 2)
+    density = np.convolve(counts, kernel, mode='valid')
+    density /= density.sum() * step
+    return grid, density
+
 
+def _binned_mean(x, y, values, bins):
+    """Mean of values in each cell of a 2D histogram, NaN for empty cells."""
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return means, x_edges, y_edges
+
+@instrument
 def save_plot(fig, filename):
     """Saving figure to file."""
     fig.savefig(filename, dpi=100, bbox_inches='tight')
     plt.close(fig)
 
+@instrument
 def plot_histogram(df, column, title):
     """
     Creating and returning a histogram for a numerical column.
@@ -28,20 +121,44 @@ def plot_histogram(df, column, title):
     ax.grid(alpha=0.3)
     return fig
 
-def plot_scatter(df, x_col, y_col, title):
-    """Plotting scatter plot with regression line."""
+@instrument
+def plot_scatter(df, x_col, y_col, title, aggregate=None, max_points=None):
+    """
+    Plotting scatter plot with regression line.
+
+    In aggregated mode the points are drawn as a log-scaled hexbin density and
+    the least-squares line is fitted on all rows.
+    """
     fig, ax = plt.subplots(figsize=(10, 6))
-    sns.regplot(x=x_col, y=y_col, data=df, ax=ax, scatter_kws={'alpha': 0.3})
+    if _use_aggregate(df, aggregate):
+        x = df[x_col].to_numpy(dtype=np.float64)
+        y = df[y_col].to_numpy(dtype=np.float64)
+        hexes = ax.hexbin(x, y, gridsize=80, bins='log', mincnt=1, cmap='Blues',
+                          rasterized=True)
+        fig.colorbar(hexes, ax=ax, label='Count')
+        slope, intercept = np.polyfit(x, y, 1)
+        line_x = np.array([x.min(), x.max()])
+        ax.plot(line_x, slope * line_x + intercept, color='C1', linewidth=2)
+    else:
+        df = _downsample(df, max_points)
+        sns.regplot(x=x_col, y=y_col, data=df, ax=ax, scatter_kws={'alpha': 0.3})
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel(x_col, fontsize=12)
     ax.set_ylabel(y_col, fontsize=12)
     ax.grid(alpha=0.3)
     return fig
 
-def plot_heatmap(df, title):
-    """Plotting correlation heatmap."""
-    numeric_df = df.select_dtypes(include=[np.number])
-    corr = numeric_df.corr()
+@instrument
+def plot_heatmap(df, title, corr=None):
+    """
+    Plotting correlation heatmap.
+
+    Pass a precomputed matrix as corr (e.g. DatasetStats.corr()) to skip
+    computing it from df; df may then be None.
+    """
+    if corr is None:
+        numeric_df = df.select_dtypes(include=[np.number])
+        corr = numeric_df.corr()
 
     fig, ax = plt.subplots(figsize=(12, 10))
     sns.heatmap(corr, annot=True, fmt='.2f', cmap='coolwarm', ax=ax,
@@ -49,6 +166,7 @@ def plot_heatmap(df, title):
     ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
     return fig
 
+@instrument
 def plot_boxplot(df, x_col, y_col, title):
     """Plotting boxplot."""
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -60,22 +178,115 @@ def plot_boxplot(df, x_col, y_col, title):
     ax.grid(alpha=0.3, axis='y')
     return fig
 
-def plot_pairplot(df, columns, title=None):
-    """Creating pair plot for selected columns."""
-    pairplot = sns.pairplot(df[columns], diag_kind='kde',
-                            plot_kws={'alpha': 0.6, 's': 30},
-                            diag_kws={'alpha': 0.7})
+@instrument
+def plot_pairplot(df, columns, title=None, aggregate=None, max_points=None):
+    """
+    Creating pair plot for selected columns.
+
+    In aggregated mode the off-diagonal panels are hexbin densities and the
+    diagonal KDEs are evaluated on a grid from binned counts.
+    """
+    if not _use_aggregate(df, aggregate):
+        df = _downsample(df, max_points)
+        pairplot = sns.pairplot(df[columns], diag_kind='kde',
+                                plot_kws={'alpha': 0.6, 's': 30},
+                                diag_kws={'alpha': 0.7})
+        if title:
+            pairplot.fig.suptitle(title, y=1.02, fontsize=16, fontweight='bold')
+        return pairplot.fig
+
+    n = len(columns)
+    fig, axes = plt.subplots(n, n, figsize=(2.5 * n, 2.5 * n), squeeze=False)
+    data = {col: df[col].to_numpy(dtype=np.float64) for col in columns}
+    for i, y_col in enumerate(columns):
+        for j, x_col in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                grid, density = binned_kde(data[x_col])
+                ax.fill_between(grid, density, alpha=0.7, rasterized=True)
+                ax.set_yticks([])
+            else:
+                ax.hexbin(data[x_col], data[y_col], gridsize=40, bins='log', mincnt=1,
+                          cmap='Blues', rasterized=True)
+            ax.set_xlabel(x_col if i == n - 1 else '')
+            ax.set_ylabel(y_col if j == 0 else '')
+            if i < n - 1:
+                ax.set_xticklabels([])
+            if j > 0:
+                ax.set_yticklabels([])
+    fig.tight_layout()
     if title:
-        pairplot.fig.suptitle(title, y=1.02, fontsize=16, fontweight='bold')
-    return pairplot.fig
+        fig.suptitle(title, y=1.02, fontsize=16, fontweight='bold')
+    return fig
 
-def plot_violin(df, x_col, y_col, title):
-    """Plotting violin plot."""
+@instrument
+def plot_violin(df, x_col, y_col, title, aggregate=None, max_points=None):
+    """
+    Plotting violin plot.
+
+    In aggregated mode each violin is a KDE evaluated on a shared grid from
+    binned counts, with the median and quartiles marked. max_points samples
+    every x_col group proportionally.
+    """
     fig, ax = plt.subplots(figsize=(12, 6))
-    sns.violinplot(x=x_col, y=y_col, data=df, ax=ax)
+    if _use_aggregate(df, aggregate):
+        values = df[y_col].to_numpy(dtype=np.float64)
+        bounds = (np.nanmin(values), np.nanmax(values))
+        groups = df.groupby(x_col, observed=True, sort=True)[y_col]
+        labels = []
+        for position, (label, group) in enumerate(groups):
+            group = group.to_numpy(dtype=np.float64)
+            grid, density = binned_kde(group, bounds=bounds)
+            width = 0.4 * density / density.max()
+            ax.fill_betweenx(grid, position - width, position + width, color=f'C{position % 10}',
+                             alpha=0.8, linewidth=0, rasterized=True)
+            q1, median, q3 = np.nanquantile(group, [0.25, 0.5, 0.75])
+            ax.vlines(position, q1, q3, color='black', linewidth=4)
+            ax.scatter([position], [median], color='white', s=20, zorder=3)
+            labels.append(str(label))
+        ax.set_xticks(range(len(labels)), labels)
+    else:
+        df = _downsample(df, max_points, by=x_col)
+        sns.violinplot(x=x_col, y=y_col, data=df, ax=ax)
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel(x_col, fontsize=12)
     ax.set_ylabel(y_col, fontsize=12)
     ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
     ax.grid(alpha=0.3, axis='y')
+    return fig
+
+@instrument
+def plot_geographic(df, value_col, title, lon_col='longitude', lat_col='latitude',
+                    aggregate=None, max_points=None, bins=GRID_SIZE):
+    """
+    Plotting value_col on a longitude/latitude map.
+
+    In aggregated mode the map is a bins x bins grid of cell means drawn as a
+    single rasterized mesh; otherwise every row is one colored point.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if _use_aggregate(df, aggregate):
+        means, x_edges, y_edges = _binned_mean(
+            df[lon_col].to_numpy(dtype=np.float64),
+            df[lat_col].to_numpy(dtype=np.float64),
+            df[value_col].to_numpy(dtype=np.float64),
+            bins
+        )
+        mappable = ax.pcolormesh(x_edges, y_edges, means.T, cmap='viridis', rasterized=True)
+    else:
+        df = _downsample(df, max_points)
+        mappable = ax.scatter(
+            df[lon_col],
+            df[lat_col],
+            c=df[value_col],
+            cmap='viridis',
+            s=5,
+            alpha=0.6
+        )
+
+    plt.colorbar(mappable, label=value_col.replace('_', ' ').title(), ax=ax)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel('Longitude', fontsize=12)
+    ax.set_ylabel('Latitude', fontsize=12)
+    ax.grid(alpha=0.3)
     return fig
\ No newline at end of file